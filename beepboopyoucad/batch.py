@@ -0,0 +1,82 @@
+"""
+Batch runner that plays many games against a shared round budget
+"""
+from collections import deque
+from datetime import datetime
+from typing import Callable, List
+
+from . import profiling
+from .game import Game
+
+
+def run_batch(
+    games: List[Game],
+    budget: int,
+    max_rounds: int | None = None,
+    new_game: Callable[[], Game] | None = None,
+) -> List[Game]:
+    """
+    Play rounds across games round-robin until the budget is spent
+
+    Games that stop early (see ConvergencePolicy) leave their unspent rounds
+    in the shared budget, which goes to the games still running, or to fresh
+    games from new_game once every game has finished.
+
+    If BEEPBOOPYOUCAD_PROFILE is set, a profile of the whole batch (and only
+    that batch) is written next to the first game.
+
+    Args:
+        games: Started games to play
+        budget: Total number of rounds (API calls) to spend across all games
+        max_rounds: Optional cap on the length of any one game
+        new_game: Optional factory returning a new, started game
+
+    Returns:
+        Every game that was played, including ones created by new_game
+    """
+    # The batch owns an env-enabled profiler: fresh at the start, discarded at
+    # the end, so one batch's timings never leak into the next
+    owns_profiler = profiling.env_enabled() and profiling.get_profiler() is None
+    if owns_profiler:
+        profiling.enable()
+
+    try:
+        played = list(games)
+        active = deque(games)
+
+        while budget > 0:
+            fresh = not active
+            if fresh:
+                if new_game is None:
+                    break
+                game = new_game()
+                played.append(game)
+                active.append(game)
+
+            game = active.popleft()
+            if max_rounds is not None and len(game.rounds) >= max_rounds:
+                if fresh:
+                    break
+                continue
+
+            rounds_before = len(game.rounds)
+            can_continue = game.play_round()
+            rounds_played = len(game.rounds) - rounds_before
+            # Only rounds that actually happened cost anything
+            budget -= rounds_played
+            if fresh and rounds_played == 0:
+                # A brand-new game that can't make progress; more won't either
+                break
+            if can_continue and (max_rounds is None or len(game.rounds) < max_rounds):
+                active.append(game)
+
+        profiler = profiling.get_profiler()
+        if profiler and played:
+            if played[0].writer:
+                played[0].writer.flush()
+            profiler.write(played[0].output_dir, f"batch_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+    finally:
+        if owns_profiler:
+            profiling.disable()
+
+    return played
@@ -4,6 +4,8 @@ Claude integration for text generation and image description
 import os
 from anthropic import Anthropic
 
+from .profiling import phase
+
 
 class ClaudeClient:
     """Client for interacting with Claude AI"""
@@ -27,16 +29,46 @@ class ClaudeClient:
         Returns:
             A creative sentence suitable for illustration
         """
-        response = self.client.messages.create(
-            model="claude-opus-4-5-20251101",
-            max_tokens=100,
-            messages=[{
-                "role": "user",
-                "content": "Generate a single creative, visual sentence that would be fun to illustrate. It should be concrete and imaginative. Just output the sentence, nothing else."
-            }]
-        )
+        with phase("claude_api"):
+            response = self.client.messages.create(
+                model="claude-opus-4-5-20251101",
+                max_tokens=100,
+                messages=[{
+                    "role": "user",
+                    "content": "Generate a single creative, visual sentence that would be fun to illustrate. It should be concrete and imaginative. Just output the sentence, nothing else."
+                }]
+            )
         return response.content[0].text.strip()
-    
+
+    def generate_initial_sentences(self, count: int) -> list[str]:
+        """
+        Generate several distinct starting sentences in a single request
+
+        Args:
+            count: How many sentences to ask for
+
+        Returns:
+            The sentences Claude produced (may be fewer than requested)
+        """
+        import re
+
+        with phase("claude_api"):
+            response = self.client.messages.create(
+                model="claude-opus-4-5-20251101",
+                max_tokens=100 * count,
+                messages=[{
+                    "role": "user",
+                    "content": f"Generate {count} different creative, visual sentences that would be fun to illustrate. Each should be concrete and imaginative, and no two should share a subject. Output one sentence per line, with no numbering and nothing else."
+                }]
+            )
+        sentences = []
+        for line in response.content[0].text.splitlines():
+            # Drop any numbering or bullets Claude adds anyway
+            line = re.sub(r"^\s*(?:\d+[.)]|[-*•])\s*", "", line).strip().strip('"')
+            if line:
+                sentences.append(line)
+        return sentences
+
     def describe_image(self, image_path: str, prompt: str | None = None) -> str:
         """
         Describe what Claude sees in an image
@@ -48,12 +80,53 @@ class ClaudeClient:
         Returns:
             A sentence describing what Claude sees in the image
         """
-        import base64
-        from pathlib import Path
-
         if prompt is None:
             prompt = "Caption this. Keep it terse, like a New Yorker cartoon, but more creative. Avoid cliches."
 
+        with phase("encode_image"):
+            base64_image, media_type = self._encode_image(image_path)
+
+        with phase("claude_api"):
+            response = self.client.messages.create(
+                model="claude-opus-4-5-20251101",
+                max_tokens=150,
+                messages=[{
+                    "role": "user",
+                    "content": [
+                        {
+                            "type": "image",
+                            "source": {
+                                "type": "base64",
+                                "media_type": media_type,
+                                "data": base64_image,
+                            },
+                        },
+                        {
+                            "type": "text",
+                            "text": prompt
+                        }
+                    ],
+                }]
+            )
+        text = response.content[0].text.strip()
+        # Remove surrounding quotes if the entire response is quoted
+        if (text.startswith('"') and text.endswith('"')) or (text.startswith("'") and text.endswith("'")):
+            text = text[1:-1]
+        return text
+
+    def _encode_image(self, image_path: str) -> tuple[str, str]:
+        """
+        Read an image and prepare it for the messages API
+
+        Args:
+            image_path: Path to the image file
+
+        Returns:
+            Tuple of (base64 data, media type)
+        """
+        import base64
+        from pathlib import Path
+
         # Read and encode the image
         image_data = Path(image_path).read_bytes()
         base64_image = base64.b64encode(image_data).decode("utf-8")
@@ -68,30 +141,4 @@ class ClaudeClient:
             ".webp": "image/webp"
         }
         media_type = media_type_map.get(extension, "image/jpeg")
-
-        response = self.client.messages.create(
-            model="claude-opus-4-5-20251101",
-            max_tokens=150,
-            messages=[{
-                "role": "user",
-                "content": [
-                    {
-                        "type": "image",
-                        "source": {
-                            "type": "base64",
-                            "media_type": media_type,
-                            "data": base64_image,
-                        },
-                    },
-                    {
-                        "type": "text",
-                        "text": prompt
-                    }
-                ],
-            }]
-        )
-        text = response.content[0].text.strip()
-        # Remove surrounding quotes if the entire response is quoted
-        if (text.startswith('"') and text.endswith('"')) or (text.startswith("'") and text.endswith("'")):
-            text = text[1:-1]
-        return text
+        return base64_image, media_type
@@ -0,0 +1,145 @@
+"""
+Stop policies that end a game once the chain stops going anywhere
+"""
+import re
+from typing import Sequence
+
+# Letters and digits in any script, keeping contractions like "don't" whole
+_WORD_RE = re.compile(r"[^\W_]+(?:'[^\W_]+)*")
+
+
+def text_similarity(a: str, b: str) -> float:
+    """
+    Cheap similarity between two captions
+
+    Args:
+        a: First caption
+        b: Second caption
+
+    Returns:
+        Jaccard similarity of the casefolded word sets, from 0.0 to 1.0. Two
+        captions without any words give no signal, so they score 0.0
+    """
+    words_a = set(_WORD_RE.findall(a.casefold()))
+    words_b = set(_WORD_RE.findall(b.casefold()))
+    if not words_a or not words_b:
+        return 0.0
+    return len(words_a & words_b) / len(words_a | words_b)
+
+
+def image_hash(image_path: str) -> int:
+    """
+    Average hash of an image: 64 bits, one per pixel of an 8x8 grayscale thumbnail
+
+    Args:
+        image_path: Path to the image file
+
+    Returns:
+        The hash as an integer
+    """
+    from PIL import Image
+
+    with Image.open(image_path) as img:
+        pixels = list(img.convert("L").resize((8, 8)).getdata())
+    mean = sum(pixels) / len(pixels)
+    bits = 0
+    for pixel in pixels:
+        bits = (bits << 1) | (pixel >= mean)
+    return bits
+
+
+class ConvergencePolicy:
+    """Ends a game when captions plateau or the chain cycles back on itself"""
+
+    def __init__(
+        self,
+        similarity: float = 0.8,
+        plateau_rounds: int = 3,
+        cycle_similarity: float = 0.9,
+        lookback: int = 50,
+        use_image_hash: bool = False,
+        hash_distance: int = 4,
+    ):
+        """
+        Initialize the policy
+
+        Args:
+            similarity: Caption-to-caption similarity that counts as "no drift"
+            plateau_rounds: Consecutive no-drift captions needed to call a plateau
+            cycle_similarity: Similarity to an older caption that counts as a cycle
+            lookback: How many recent rounds to compare against
+            use_image_hash: Also compare images by average hash
+            hash_distance: Max differing hash bits for two images to count as the same
+        """
+        self.similarity = similarity
+        self.plateau_rounds = plateau_rounds
+        self.cycle_similarity = cycle_similarity
+        self.lookback = lookback
+        self.use_image_hash = use_image_hash
+        self.hash_distance = hash_distance
+        self._hashes: dict[str, int] = {}
+
+    def check(self, rounds: Sequence) -> str | None:
+        """
+        Decide whether the game should stop after its latest round
+
+        Args:
+            rounds: The game's rounds, oldest first
+
+        Returns:
+            A human-readable stop reason, or None to keep playing
+        """
+        recent = rounds[-self.lookback:]
+        if not recent:
+            return None
+        if recent[-1].content_type == "text":
+            return self._check_text(recent)
+        if self.use_image_hash:
+            return self._check_image(recent)
+        return None
+
+    def _check_text(self, recent: Sequence) -> str | None:
+        texts = [r for r in recent if r.content_type == "text"]
+        latest = texts[-1]
+
+        # Plateau: the last few captions barely differ from their predecessors
+        if len(texts) > self.plateau_rounds:
+            window = texts[-(self.plateau_rounds + 1):]
+            if all(
+                text_similarity(prev.content, cur.content) >= self.similarity
+                for prev, cur in zip(window, window[1:])
+            ):
+                return f"converged: captions stopped changing after round {window[0].round_num}"
+
+        # Cycle: the latest caption comes back to an older one. Skip the trailing
+        # run of near-identical captions (that's a plateau still forming) and the
+        # dissimilar caption just before it, so a cycle always has a detour in it
+        run_start = len(texts) - 1
+        while run_start > 0 and text_similarity(texts[run_start - 1].content, texts[run_start].content) >= self.similarity:
+            run_start -= 1
+        for earlier in reversed(texts[:max(run_start - 1, 0)]):
+            if text_similarity(earlier.content, latest.content) >= self.cycle_similarity:
+                return f"cycle: round {latest.round_num} repeats round {earlier.round_num}"
+
+        return None
+
+    def _check_image(self, recent: Sequence) -> str | None:
+        images = [r for r in recent if r.content_type == "image"]
+        latest = images[-1]
+        latest_hash = self._hash(latest.content)
+        if latest_hash is None:
+            return None
+        for earlier in reversed(images[:-1]):
+            earlier_hash = self._hash(earlier.content)
+            if earlier_hash is not None and bin(latest_hash ^ earlier_hash).count("1") <= self.hash_distance:
+                return f"cycle: image in round {latest.round_num} repeats round {earlier.round_num}"
+        return None
+
+    def _hash(self, image_path: str) -> int | None:
+        if image_path not in self._hashes:
+            try:
+                self._hashes[image_path] = image_hash(image_path)
+            except OSError:
+                # Missing or unreadable images just don't count as matches
+                return None
+        return self._hashes[image_path]
@@ -2,23 +2,55 @@
 Game engine for "Eat Poop You Cat" / "Picture Sentence Picture"
 """
 from pathlib import Path
-from datetime import datetime
-from typing import List, Dict
-import json
+from datetime import datetime, timedelta
+from typing import Dict
+import sys
 
 from .claude_client import ClaudeClient
+from .convergence import ConvergencePolicy
 from .google_client import NanoBananaClient
+from .history import RoundHistory
+from .profiling import phase
+from .writer import BackgroundWriter, atomic_write_text
+
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+# Games longer than this list only their first and last rounds in the summary
+SUMMARY_MAX_ROUNDS = 100
 
 
 class GameRound:
     """Represents a single round in the game"""
 
+    __slots__ = ("round_num", "content_type", "content", "_timestamp")
+
     def __init__(self, round_num: int, content_type: str, content: str, timestamp: str | None = None):
         self.round_num = round_num
-        self.content_type = content_type  # "text" or "image"
+        self.content_type = sys.intern(content_type)  # "text" or "image"
         self.content = content  # sentence or image path
         self.timestamp = timestamp or datetime.now().isoformat()
 
+    @property
+    def timestamp(self) -> str:
+        """ISO timestamp, kept in memory as integer microseconds since the epoch"""
+        if isinstance(self._timestamp, int):
+            return (_EPOCH + self._timestamp * _MICROSECOND).isoformat()
+        return self._timestamp
+
+    @timestamp.setter
+    def timestamp(self, value: str):
+        try:
+            parsed = datetime.fromisoformat(value)
+        except ValueError:
+            parsed = None
+        if parsed is None or parsed.tzinfo is not None or parsed.isoformat() != value:
+            # Keep anything that wouldn't round-trip exactly as the original string
+            self._timestamp = value
+        else:
+            self._timestamp = (parsed - _EPOCH) // _MICROSECOND
+
     def to_dict(self) -> Dict:
         return {
             "round": self.round_num,
@@ -40,7 +72,7 @@ class GameRound:
 class Game:
     """Main game controller for Picture Sentence Picture"""
 
-    def __init__(self, output_dir: str = "output", game_id: str | None = None, style: str | None = None, describe: str | None = None, cmd_prefix: str = ""):
+    def __init__(self, output_dir: str = "output", game_id: str | None = None, style: str | None = None, describe: str | None = None, cmd_prefix: str = "", stop_policy: ConvergencePolicy | None = None, writer: BackgroundWriter | None = None, prefetch: bool = False):
         """
         Initialize the game
 
@@ -50,6 +82,9 @@ class Game:
             style: Art style for image generation
             describe: Prompt for Claude when describing images
             cmd_prefix: Command prefix for continue instructions (e.g., "uv run ")
+            stop_policy: Optional policy that ends the game early once it converges
+            writer: Optional background writer for saves and exports. If None, they happen inline
+            prefetch: Use a round staged by a background prefetch when one matches
         """
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
@@ -57,36 +92,53 @@ class Game:
         self.claude = ClaudeClient()
         self.banana = NanoBananaClient()
 
-        self.rounds: List[GameRound] = []
         self.game_id = game_id or datetime.now().strftime("%Y%m%d_%H%M%S")
-        self.style = style
-        self.describe = describe
+        # Many games share a style and describe prompt
+        self.style = sys.intern(style) if style else style
+        self.describe = sys.intern(describe) if describe else describe
+        self.rounds = RoundHistory(self.history_file)
         self.cmd_prefix = cmd_prefix
+        self.stop_policy = stop_policy
+        self.stop_reason: str | None = None
+        self.writer = writer
+        self.prefetch = prefetch
 
     @classmethod
-    def load(cls, game_file: str, cmd_prefix: str = "") -> "Game":
+    def load(cls, game_file: str, cmd_prefix: str = "", stop_policy: ConvergencePolicy | None = None, writer: BackgroundWriter | None = None, prefetch: bool = False) -> "Game":
         """
         Load a game from a JSON file
 
+        Only the most recent rounds are read; older ones are read on demand.
+
         Args:
             game_file: Path to the game JSON file
             cmd_prefix: Command prefix for continue instructions
+            stop_policy: Optional policy that ends the game early once it converges
+            writer: Optional background writer for saves and exports
+            prefetch: Use a round staged by a background prefetch when one matches
 
         Returns:
             Game instance with loaded state
         """
         game_path = Path(game_file)
-        with open(game_path) as f:
-            data = json.load(f)
+        rounds, data = RoundHistory.load(game_path)
 
         game = cls(
             output_dir=str(game_path.parent),
             game_id=data["game_id"],
             style=data.get("style"),
             describe=data.get("describe"),
-            cmd_prefix=cmd_prefix
+            cmd_prefix=cmd_prefix,
+            stop_policy=stop_policy,
+            writer=writer,
+            prefetch=prefetch
         )
-        game.rounds = [GameRound.from_dict(r) for r in data["rounds"]]
+        if rounds.path == game.history_file:
+            game.rounds = rounds
+        else:
+            # Saves go to the standard file name, so bring every round along
+            game.rounds = RoundHistory(game.history_file, rounds)
+        game.stop_reason = data.get("stop_reason")
         return game
 
     def start(self, sentence: str):
@@ -110,48 +162,98 @@ class Game:
             print("❌ Error: Game not started. Call start() first.")
             return False
 
-        last_round = self.rounds[-1]
+        if self.stop_reason:
+            print(f"🛑 Game over: {self.stop_reason}")
+            return False
+
+        if self.writer:
+            # Don't pay for a round if the last save already failed
+            self.writer.check()
+
         round_num = len(self.rounds) + 1
 
         print(f"🎮 Round {round_num}")
         print("=" * 60)
 
+        with phase("play_round"):
+            staged = None
+            if self.prefetch:
+                from .prefetch import take_staged_round
+                staged = take_staged_round(self)
+
+            if staged:
+                print("⚡ Using prefetched round")
+                self.rounds.append(staged)
+            else:
+                image_path = self.output_dir / f"round_{round_num}_{self.game_id}.png"
+                self.rounds.append(self._compute_round(image_path))
+
+            if self.stop_policy:
+                with phase("stop_policy"):
+                    self.stop_reason = self.stop_policy.check(self.rounds)
+                if self.stop_reason:
+                    print(f"🛑 Stopping early: {self.stop_reason}")
+
+            # Save after each round
+            self._save_game_history()
+
+        return self.stop_reason is None
+
+    def _compute_round(self, image_path: Path) -> GameRound:
+        """
+        Ask the next player for a response to the last round, without saving it to the history
+
+        Args:
+            image_path: Where to save the image if the next round is a drawing
+
+        Returns:
+            The new round
+        """
+        last_round = self.rounds[-1]
+        round_num = len(self.rounds) + 1
+
         if last_round.content_type == "text":
             # Text -> Image
             print("Nano Banana draws the sentence...")
-            image_path = self.output_dir / f"round_{round_num}_{self.game_id}.png"
-
-            self.banana.generate_image(last_round.content, str(image_path), style=self.style)
+            with phase("generate_image"):
+                self.banana.generate_image(last_round.content, str(image_path), style=self.style)
             print(f"🎨 Image saved: {image_path}")
-            self.rounds.append(GameRound(round_num, "image", str(image_path)))
+            return GameRound(round_num, "image", str(image_path))
 
-        else:
-            # Image -> Text
-            print("Claude describes the image...")
+        # Image -> Text
+        print("Claude describes the image...")
+        with phase("describe_image"):
             description = self.claude.describe_image(last_round.content, prompt=self.describe)
-            print(f"📝 Description: {description}")
-            self.rounds.append(GameRound(round_num, "text", description))
-
-        # Save after each round
-        self._save_game_history()
+        print(f"📝 Description: {description}")
+        return GameRound(round_num, "text", description)
 
-        return True
+    @property
+    def history_file(self) -> Path:
+        """Path of this game's JSON history file"""
+        return self.output_dir / f"game_{self.game_id}.json"
 
     def _save_game_history(self):
         """Save the game history to a JSON file"""
-        history_file = self.output_dir / f"game_{self.game_id}.json"
-        history = {
-            "game_id": self.game_id,
-            "style": self.style,
-            "describe": self.describe,
-            "rounds": [r.to_dict() for r in self.rounds]
-        }
-
-        with open(history_file, "w") as f:
-            json.dump(history, f, indent=2)
-
+        with phase("snapshot_history"):
+            write = self.rounds.save_job(
+                {"game_id": self.game_id, "style": self.style, "describe": self.describe},
+                {"stop_reason": self.stop_reason}
+            )
+        self._run_io(self._write_history, self.history_file, write)
+
+    @staticmethod
+    def _write_history(history_file: Path, write):
+        """Run a history save job"""
+        write()
         print(f"💾 Game saved: {history_file}")
 
+    def _run_io(self, fn, *args):
+        """Run a write job on the background writer if there is one, else inline"""
+        if self.writer:
+            self.writer.submit(fn, *args)
+        else:
+            fn(*args)
+
     def print_summary(self):
         """Print a summary of the game progression"""
         print("\n📊 Game Summary:")
@@ -159,8 +261,16 @@ class Game:
             print(f"🎨 Style: {self.style}")
         print("-" * 60)
 
-        for round_data in self.rounds:
-            if round_data.content_type == "text":
+        half = SUMMARY_MAX_ROUNDS // 2
+        if len(self.rounds) > SUMMARY_MAX_ROUNDS:
+            listing = [*self.rounds[:half], None, *self.rounds[-half:]]
+        else:
+            # Streams older rounds back from disk
+            listing = self.rounds
+        for round_data in listing:
+            if round_data is None:
+                print(f"\n... {len(self.rounds) - 2 * half} more rounds in {self.history_file} ...")
+            elif round_data.content_type == "text":
                 print(f"\nRound {round_data.round_num} (Text):")
                 print(f"  {round_data.content}")
             else:
@@ -174,22 +284,34 @@ class Game:
             print(f"  Started with: {self.rounds[0].content}")
             print(f"  Ended with:   {self.rounds[-1].content}")
 
+        if self.stop_reason:
+            print(f"\n🛑 Stopped early: {self.stop_reason}")
+
     def print_continue_command(self):
         """Print the command to continue this game"""
-        history_file = self.output_dir / f"game_{self.game_id}.json"
-        print(f"\n▶️  Continue: {self.cmd_prefix}beepboopyoucad --continue {history_file}")
+        if self.stop_reason:
+            return
+        print(f"\n▶️  Continue: {self.cmd_prefix}beepboopyoucad --continue {self.history_file}")
 
     def save_html(self):
         """Save an HTML file showing the game conversation"""
-        import base64
-
         html_file = self.output_dir / f"game_{self.game_id}.html"
+        if self.rounds.unsaved:
+            self._save_game_history()
+        # The writer job reads the rounds back from the game file, after the
+        # save above (or the last round's) has put them there
+        self._run_io(self._write_html, html_file, self.game_id, self.style, self.rounds, len(self.rounds))
+
+    @staticmethod
+    def _write_html(html_file: Path, game_id: str, style: str | None, history: RoundHistory, count: int):
+        """Render the first `count` saved rounds to HTML and write it to disk"""
+        import base64
 
         html_parts = [
             "<!DOCTYPE html>",
             "<html>",
             "<head>",
-            f"<title>Beep Boop You CAD - Game {self.game_id}</title>",
+            f"<title>Beep Boop You CAD - Game {game_id}</title>",
             "<style>",
             "body { font-family: Georgia, serif; max-width: 800px; margin: 0 auto; padding: 20px; background: #f5f5f5; }",
             "h1 { text-align: center; color: #333; }",
@@ -205,10 +327,10 @@ class Game:
             f"<h1>Beep Boop You CAD</h1>",
         ]
 
-        if self.style:
-            html_parts.append(f"<p style='text-align:center;color:#666;'>Style: {self.style}</p>")
+        if style:
+            html_parts.append(f"<p style='text-align:center;color:#666;'>Style: {style}</p>")
 
-        for round_data in self.rounds:
+        for round_data in history.read_saved(count):
             html_parts.append("<div class='round'>")
             html_parts.append(f"<div class='round-num'>Round {round_data.round_num}</div>")
 
@@ -219,8 +341,9 @@ class Game:
                 try:
                     image_path = Path(round_data.content)
                     if image_path.exists():
-                        image_data = image_path.read_bytes()
-                        b64 = base64.b64encode(image_data).decode('utf-8')
+                        with phase("html_base64"):
+                            image_data = image_path.read_bytes()
+                            b64 = base64.b64encode(image_data).decode('utf-8')
                         ext = image_path.suffix.lower()
                         mime = "image/png" if ext == ".png" else "image/jpeg"
                         html_parts.append(f"<div class='image'><img src='data:{mime};base64,{b64}'></div>")
@@ -232,10 +355,11 @@ class Game:
             html_parts.append("</div>")
 
         html_parts.extend([
-            f"<div class='meta'>Game ID: {self.game_id}</div>",
+            f"<div class='meta'>Game ID: {game_id}</div>",
             "</body>",
             "</html>"
         ])
 
-        html_file.write_text("\n".join(html_parts))
+        with phase("write_html"):
+            atomic_write_text(html_file, "\n".join(html_parts))
         print(f"🌐 HTML saved: {html_file}")
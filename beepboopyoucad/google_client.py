@@ -6,6 +6,8 @@ from pathlib import Path
 
 from google import genai
 
+from .profiling import phase
+
 
 class NanoBananaClient:
     """Client for interacting with Gemini image generation"""
@@ -42,26 +44,30 @@ class NanoBananaClient:
             formatted_prompt = f"<prompt>{prompt}</prompt><rule>do not output any text!</rule>"
 
         try:
-            response = self.client.models.generate_content(
-                model="gemini-2.5-flash-image",
-                contents=[formatted_prompt],
-            )
+            with phase("gemini_api"):
+                response = self.client.models.generate_content(
+                    model="gemini-2.5-flash-image",
+                    contents=[formatted_prompt],
+                )
 
             for part in response.parts:
                 if part.inline_data is not None:
-                    image = part.as_image()
-                    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
-                    image.save(output_path)
+                    with phase("save_image"):
+                        image = part.as_image()
+                        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+                        image.save(output_path)
                     return output_path
 
             # If no image was returned, fall back to placeholder
             print("Warning: No image in API response, creating placeholder image")
-            return self._create_placeholder_image(prompt, output_path)
+            with phase("placeholder_image"):
+                return self._create_placeholder_image(prompt, output_path)
 
         except Exception as e:
             # Fallback: Create a placeholder image with PIL
             print(f"Warning: Gemini API call failed ({e}), creating placeholder image")
-            return self._create_placeholder_image(prompt, output_path)
+            with phase("placeholder_image"):
+                return self._create_placeholder_image(prompt, output_path)
 
     def _create_placeholder_image(self, prompt: str, output_path: str) -> str:
         """
@@ -0,0 +1,330 @@
+"""
+Compact, file-backed round history for long games
+
+Only the most recent rounds stay in memory; older ones are read back from the
+game file on demand. Game files are written one round per line, so new rounds
+are appended in place and loading a game only reads the file's head and tail:
+
+    {"game_id": "...", "style": "...", "describe": "...", "rounds": [
+    {"round": 1, "type": "text", ...}
+    ,{"round": 2, "type": "image", ...}
+    ], "stop_reason": null}
+
+That is still plain JSON. Files in the older pretty-printed layout are loaded
+whole and rewritten in this layout on their next save.
+"""
+import json
+import os
+from array import array
+from collections.abc import Sequence
+from functools import partial
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple
+
+from .profiling import phase
+from .writer import atomic_write_text
+
+# How many recent rounds stay in memory; at least ConvergencePolicy's lookback
+RESIDENT_ROUNDS = 64
+
+_ROUNDS_OPEN = '"rounds": [\n'
+_TAIL_CHUNK = 64 * 1024
+
+
+def _round_from_line(line: bytes):
+    from .game import GameRound
+
+    return GameRound.from_dict(json.loads(line.lstrip(b",")))
+
+
+def _parse_round(line: bytes):
+    """A round from one whole round line, or None if the line is torn or isn't a round"""
+    if not line.endswith(b"\n"):
+        return None
+    try:
+        return _round_from_line(line)
+    except (ValueError, KeyError, TypeError, AttributeError):
+        return None
+
+
+def _parse_closing(line: bytes) -> Dict | None:
+    """The fields after the rounds from a whole closing line, or None if it isn't one"""
+    if not line.startswith(b"]") or not line.endswith(b"\n"):
+        return None
+    if line.strip() == b"]}":
+        return {}
+    try:
+        tail = json.loads(b"{" + line[1:].lstrip(b", "))
+    except ValueError:
+        return None
+    return tail if isinstance(tail, dict) else None
+
+
+def _read_tail_lines(f, size: int, start: int, count: int) -> List[bytes]:
+    """Read up to the last `count` lines of f that begin at or after byte `start`"""
+    pos = size
+    buf = b""
+    while pos > start and buf.count(b"\n") <= count:
+        step = min(_TAIL_CHUNK, pos - start)
+        pos -= step
+        f.seek(pos)
+        buf = f.read(step) + buf
+    lines = buf.splitlines(keepends=True)
+    if pos > start:
+        # The first line is probably cut off
+        lines = lines[1:]
+    return lines[-count:]
+
+
+def read_first_round(path: str | Path):
+    """
+    Read a game file's first round, without loading the rest of a compact file
+
+    Args:
+        path: Game JSON file
+
+    Returns:
+        The first GameRound, or None if the game has no rounds
+    """
+    with open(path, "rb") as f:
+        header = f.readline()
+        if header.endswith(_ROUNDS_OPEN.encode()):
+            line = f.readline()
+            return None if line.startswith(b"]") else _round_from_line(line)
+    from .game import GameRound
+
+    with open(path) as f:
+        rounds = json.load(f)["rounds"]
+    return GameRound.from_dict(rounds[0]) if rounds else None
+
+
+class RoundHistory(Sequence):
+    """The rounds of one game, oldest first, with only a recent window resident"""
+
+    def __init__(self, path: Path, rounds: Iterable = (), window: int = RESIDENT_ROUNDS):
+        """
+        Initialize a history that has not been saved in the compact layout yet
+
+        Args:
+            path: Game JSON file this history is saved to
+            rounds: Initial rounds
+            window: How many recent rounds to keep in memory once they are saved
+        """
+        self.path = Path(path)
+        self.window = window
+        self._recent = list(rounds)  # resident rounds, oldest first
+        self._recent_start = 0  # index of _recent[0]
+        self._compact = False  # whether path holds this history in the compact layout
+        self._saved = 0  # rounds handed to a save job
+        self._failed = False  # a save job failed; later ones would write at stale offsets
+        # The rest is only touched by save jobs, which run one at a time in order
+        self._durable = 0  # rounds known to be on disk; only these may be evicted
+        self._end_offset = 0  # byte offset of the closing line in path
+        self._offsets = array("q")  # byte offsets of round lines, filled in lazily
+
+    @classmethod
+    def load(cls, path: str | Path, window: int = RESIDENT_ROUNDS) -> Tuple["RoundHistory", Dict]:
+        """
+        Load a game file, reading only as much of it as needed
+
+        Args:
+            path: Game JSON file
+            window: How many recent rounds to keep in memory
+
+        Returns:
+            The history and the game's other fields (game_id, style, ...)
+        """
+        path = Path(path)
+        with open(path, "rb") as f:
+            header = f.readline()
+            if not header.endswith(_ROUNDS_OPEN.encode()):
+                return cls._load_whole(path, window)
+            size = f.seek(0, os.SEEK_END)
+            lines = _read_tail_lines(f, size, len(header), window + 1)
+
+        meta = json.loads(header[:-len(_ROUNDS_OPEN)].rstrip().rstrip(b",") + b"}")
+        end_offset = size
+        tail = _parse_closing(lines[-1]) if lines else None
+        if tail is not None:
+            end_offset -= len(lines.pop())
+            meta.update(tail)
+        else:
+            # Interrupted write: walk back to the last whole round, the next
+            # save writes over whatever follows it
+            while lines and _parse_round(lines[-1]) is None:
+                end_offset -= len(lines.pop())
+        lines = lines[-window:]
+
+        rounds = [_parse_round(line) for line in lines]
+        if None in rounds:
+            return cls._load_whole(path, window)
+        count = rounds[-1].round_num if rounds else 0
+        if [r.round_num for r in rounds] != list(range(count - len(rounds) + 1, count + 1)):
+            # Not numbered 1..n, so round numbers can't be used as positions
+            return cls._load_whole(path, window)
+
+        history = cls(path, rounds, window)
+        history._recent_start = count - len(rounds)
+        history._compact = True
+        history._saved = history._durable = count
+        history._end_offset = end_offset
+        history._offsets = array("q", [len(header)])
+        return history, meta
+
+    @classmethod
+    def _load_whole(cls, path: Path, window: int) -> Tuple["RoundHistory", Dict]:
+        """Load a file in the older pretty-printed layout"""
+        from .game import GameRound
+
+        with open(path) as f:
+            data = json.load(f)
+        rounds = [GameRound.from_dict(r) for r in data.pop("rounds")]
+        return cls(path, rounds, window), data
+
+    def __len__(self) -> int:
+        return self._recent_start + len(self._recent)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("round index out of range")
+        if index >= self._recent_start:
+            return self._recent[index - self._recent_start]
+        return self._read_round(index)
+
+    @property
+    def unsaved(self) -> int:
+        """How many rounds have not been handed to a save job yet"""
+        return len(self) - self._saved
+
+    def __iter__(self):
+        start = self._recent_start
+        recent = list(self._recent)
+        if start:
+            with open(self.path, "rb") as f:
+                f.seek(self._offsets[0])
+                for _ in range(start):
+                    yield _round_from_line(f.readline())
+        yield from recent
+
+    def append(self, game_round):
+        """
+        Add a round, evicting the oldest resident rounds that are safely on disk
+
+        Args:
+            game_round: The new round
+        """
+        self._recent.append(game_round)
+        evict = min(len(self._recent) - self.window, self._durable - self._recent_start)
+        if evict > 0:
+            del self._recent[:evict]
+            self._recent_start += evict
+
+    def save_job(self, meta: Dict, tail: Dict) -> Callable[[], None]:
+        """
+        Capture everything not yet saved and return a function that writes it
+
+        The returned function may run on another thread, but save jobs for one
+        history must run in the order they were created.
+
+        Args:
+            meta: Fields written before the rounds (game_id, style, ...)
+            tail: Fields written after the rounds, which may change (stop_reason)
+
+        Once a job has failed, the file may not match what the history expects,
+        so this and every job created before the failure refuse to run; load
+        the file again to carry on.
+
+        Returns:
+            A function that writes the captured state to path
+        """
+        self._check_failed()
+        count = len(self)
+        closing = "]" + (", " + json.dumps(tail)[1:] if tail else "}") + "\n"
+        if self._compact:
+            new_rounds = [r.to_dict() for r in self._recent[self._saved - self._recent_start:]]
+            job = partial(self._run_job, self._append, new_rounds, self._saved, closing, count)
+        else:
+            # Nothing has been evicted before the first compact save
+            job = partial(self._run_job, self._rewrite, meta, [r.to_dict() for r in self._recent], closing, count)
+            self._compact = True
+        self._saved = count
+        return job
+
+    def read_saved(self, count: int) -> Iterator:
+        """
+        Stream the first `count` rounds back from the file
+
+        Unlike iterating the history, this never touches the resident rounds,
+        so it is safe in a writer job queued after the save of those rounds.
+
+        Args:
+            count: Number of rounds to read; all of them must already be saved
+
+        Returns:
+            Iterator over the rounds, oldest first
+        """
+        self._check_failed()
+        if count > self._durable:
+            raise RuntimeError(f"Only {self._durable} of {count} rounds are saved to {self.path}")
+        if count == 0:
+            return
+        with open(self.path, "rb") as f:
+            f.seek(self._offsets[0])
+            for _ in range(count):
+                yield _round_from_line(f.readline())
+
+    def _check_failed(self):
+        """Raise if an earlier save job failed"""
+        if self._failed:
+            raise RuntimeError(f"An earlier save of {self.path} failed; load it again to continue")
+
+    def _run_job(self, write: Callable, *args):
+        """Run a save job, refusing if an earlier one failed"""
+        self._check_failed()
+        try:
+            write(*args)
+        except BaseException:
+            self._failed = True
+            raise
+
+    def _rewrite(self, meta: Dict, rounds: List[Dict], closing: str, count: int):
+        """Write the whole file in the compact layout"""
+        with phase("json_dumps"):
+            header = json.dumps(dict(meta, rounds=[]))[:-len("[]}")] + "[\n"
+            body = "".join(("," if i else "") + json.dumps(r) + "\n" for i, r in enumerate(rounds))
+        with phase("write_history"):
+            atomic_write_text(self.path, header + body + closing)
+        # json.dumps escapes everything outside ASCII, so characters are bytes
+        self._offsets = array("q", [len(header)])
+        self._end_offset = len(header) + len(body)
+        self._durable = count
+
+    def _append(self, rounds: List[Dict], first_index: int, closing: str, count: int):
+        """Append rounds in place, replacing the closing line"""
+        with phase("json_dumps"):
+            body = "".join(("," if first_index + i else "") + json.dumps(r) + "\n" for i, r in enumerate(rounds))
+        with phase("write_history"):
+            with open(self.path, "r+b") as f:
+                f.seek(self._end_offset)
+                f.write((body + closing).encode())
+                f.truncate()
+                f.flush()
+                os.fsync(f.fileno())
+        self._end_offset += len(body)
+        self._durable = count
+
+    def _read_round(self, index: int):
+        """Read one evicted round back from the file"""
+        offsets = self._offsets
+        with open(self.path, "rb") as f:
+            if index >= len(offsets):
+                f.seek(offsets[-1])
+                while len(offsets) <= index:
+                    f.readline()
+                    offsets.append(f.tell())
+            f.seek(offsets[index])
+            return _round_from_line(f.readline())
@@ -4,6 +4,7 @@ Main entry point for Beep Boop You CAD game
 import argparse
 import os
 import sys
+from datetime import datetime
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -17,7 +18,12 @@ def get_command_prefix() -> str:
         return "uv run "
     return ""
 
+from .convergence import ConvergencePolicy
+from . import profiling
 from .game import Game
+from .prefetch import start_prefetch
+from .seed_pool import SeedPool
+from .writer import BackgroundWriter
 
 
 def main():
@@ -33,10 +39,14 @@ Example:
   %(prog)s "A robot dancing in the rain"
   %(prog)s "A cat wearing a top hat" --style "watercolor painting"
   %(prog)s --continue output/game_xxx.json
+  %(prog)s --continue output/game_xxx.json --rounds 10 --stop-on-converge
+  %(prog)s --seed-pool seeds.json
+  %(prog)s --continue output/game_xxx.json --prefetch
 
 Environment Variables:
   ANTHROPIC_API_KEY - Required: Your Anthropic API key for Claude
   GOOGLE_API_KEY    - Required: Your Google API key for Gemini
+  BEEPBOOPYOUCAD_PROFILE - Optional: Set to 1 to profile, same as --profile
         """
     )
 
@@ -76,6 +86,38 @@ Environment Variables:
         help="Output directory for new games (default: output)"
     )
 
+    parser.add_argument(
+        "--rounds",
+        type=int,
+        default=1,
+        help="Number of rounds to play in this run (default: 1)"
+    )
+
+    parser.add_argument(
+        "--stop-on-converge",
+        action="store_true",
+        help="End the game early once captions stop changing or start repeating"
+    )
+
+    parser.add_argument(
+        "--seed-pool",
+        type=str,
+        metavar="FILE",
+        help="Start a new game from a pre-generated sentence in this pool file (refilled automatically)"
+    )
+
+    parser.add_argument(
+        "--prefetch",
+        action="store_true",
+        help="Compute the next round in the background so the next --continue is instant"
+    )
+
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Write per-phase timings and a flamegraph-compatible profile next to the game"
+    )
+
     args = parser.parse_args()
 
     default_describe = "Caption this. Keep it terse, like a New Yorker cartoon, but more creative. Avoid cliches."
@@ -91,9 +133,20 @@ Environment Variables:
         if args.describe != default_describe:
             print("❌ Error: Cannot specify --describe when using --continue (describe is saved in the game file)")
             return 1
+        if args.seed_pool:
+            print("❌ Error: Cannot use --seed-pool when using --continue")
+            return 1
+
+    if args.sentence and args.seed_pool:
+        print("❌ Error: Cannot provide a sentence when using --seed-pool")
+        return 1
+
+    if args.rounds < 1:
+        print("❌ Error: --rounds must be at least 1")
+        return 1
 
-    if not args.continue_game and not args.sentence:
-        print("❌ Error: Must provide a sentence to start a new game, or --continue to resume")
+    if not args.continue_game and not args.sentence and not args.seed_pool:
+        print("❌ Error: Must provide a sentence (or --seed-pool) to start a new game, or --continue to resume")
         parser.print_help()
         return 1
 
@@ -107,8 +160,17 @@ Environment Variables:
         print("⚠️  Warning: GOOGLE_API_KEY environment variable not set")
         print("   Image generation will use placeholder images")
 
+    if args.profile or profiling.env_enabled():
+        profiling.enable()
+
+    # Saves and exports run in the background so the next API call starts right away
+    writer = BackgroundWriter()
+    game = None
+    seed_pool = SeedPool(args.seed_pool, archive_dir=args.output) if args.seed_pool else None
+
     try:
         cmd_prefix = get_command_prefix()
+        stop_policy = ConvergencePolicy() if args.stop_on_converge else None
 
         if args.continue_game:
             # Continue existing game
@@ -116,17 +178,24 @@ Environment Variables:
             if not game_file.exists():
                 print(f"❌ Error: Game file not found: {game_file}")
                 return 1
-            game = Game.load(str(game_file), cmd_prefix=cmd_prefix)
+            game = Game.load(str(game_file), cmd_prefix=cmd_prefix, stop_policy=stop_policy, writer=writer, prefetch=args.prefetch)
             print(f"📂 Loaded game: {game.game_id} ({len(game.rounds)} rounds played)")
         else:
-            # Start new game with user's sentence
-            game = Game(output_dir=args.output, style=args.style, describe=args.describe, cmd_prefix=cmd_prefix)
-            game.start(args.sentence)
+            # Start new game with user's sentence, or one from the pool
+            sentence = seed_pool.draw() if seed_pool else args.sentence
+            game = Game(output_dir=args.output, style=args.style, describe=args.describe, cmd_prefix=cmd_prefix, stop_policy=stop_policy, writer=writer, prefetch=args.prefetch)
+            game.start(sentence)
             print(f"🎮 Started new game: {game.game_id}")
 
-        print()
-        game.play_round()
+        for _ in range(args.rounds):
+            print()
+            if not game.play_round():
+                break
         game.save_html()
+        writer.flush()
+        if args.prefetch and not game.stop_reason:
+            start_prefetch(str(game.history_file))
+            print("⚡ Prefetching the next round in the background")
         game.print_summary()
         game.print_continue_command()
         return 0
@@ -141,6 +210,19 @@ Environment Variables:
         traceback.print_exc()
         return 1
 
+    finally:
+        # Never lose queued writes, even on Ctrl-C
+        try:
+            writer.close()
+        except Exception as e:
+            print(f"\n❌ Error: Failed to save game ({e})")
+        profiler = profiling.get_profiler()
+        if profiler and game:
+            # One profile per run, so --continue doesn't overwrite the last one
+            run = datetime.now().strftime("%Y%m%d_%H%M%S")
+            table_file, folded_file = profiler.write(game.output_dir, f"{game.game_id}_{run}")
+            print(f"⏱️  Profile saved: {table_file}, {folded_file}")
+
 
 if __name__ == "__main__":
     exit(main())
@@ -0,0 +1,212 @@
+"""
+Speculative prefetch: compute a game's next round in the background so the
+next --continue can commit it instantly
+
+Staged rounds live in a ".prefetch" directory next to the game, keyed by a
+hash of the game's last round. A staged round is only used if the game still
+ends with that exact round, and anything older than the TTL is thrown away.
+"""
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from .writer import atomic_write_text
+
+STAGING_DIRNAME = ".prefetch"
+DEFAULT_TTL = 60 * 60
+# How long --continue waits for a prefetch that is still running: about one
+# provider call, since past that computing the round here is no slower
+DEFAULT_WAIT = 30
+
+
+def round_key(game) -> str:
+    """
+    Key identifying the state a staged round was computed from
+
+    Args:
+        game: The game
+
+    Returns:
+        Hex digest of the game id, style, describe prompt and last round
+    """
+    state = {
+        "game_id": game.game_id,
+        "style": game.style,
+        "describe": game.describe,
+        "num_rounds": len(game.rounds),
+        "last_round": game.rounds[-1].to_dict(),
+    }
+    return hashlib.sha256(json.dumps(state, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+def staging_dir(game) -> Path:
+    """Directory where staged rounds for this game's output dir live"""
+    return game.output_dir / STAGING_DIRNAME
+
+
+def expire_staged(directory: Path, ttl: float = DEFAULT_TTL):
+    """
+    Delete staged files older than the TTL
+
+    Args:
+        directory: Staging directory
+        ttl: Maximum age in seconds
+    """
+    if not directory.exists():
+        return
+    cutoff = time.time() - ttl
+    for path in directory.iterdir():
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def stage_next_round(game_file: str):
+    """
+    Compute the next round of a saved game into the staging area
+
+    Args:
+        game_file: Path to the game JSON file
+    """
+    from .game import Game
+
+    game = Game.load(game_file)
+    if not game.rounds or game.stop_reason:
+        return
+
+    directory = staging_dir(game)
+    directory.mkdir(parents=True, exist_ok=True)
+    expire_staged(directory)
+
+    key = round_key(game)
+    stem = f"{game.game_id}_{key}"
+    staged_file = directory / f"{stem}.json"
+    lock_file = directory / f"{stem}.lock"
+    if staged_file.exists():
+        return
+    try:
+        # Only one prefetch per game state
+        fd = os.open(lock_file, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except FileExistsError:
+        return
+    with os.fdopen(fd, "w") as f:
+        f.write(str(os.getpid()))
+
+    try:
+        new_round = game._compute_round(directory / f"{stem}.png")
+        atomic_write_text(staged_file, json.dumps({"key": key, "round": new_round.to_dict()}, indent=2))
+    finally:
+        lock_file.unlink(missing_ok=True)
+
+
+def _lock_held(lock_file: Path) -> bool:
+    """Whether a prefetch holding this lock file is still running"""
+    try:
+        pid = int(lock_file.read_text())
+    except FileNotFoundError:
+        return False
+    except ValueError:
+        # Lock just created, pid not written yet
+        return True
+    if os.name != "posix":
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def start_prefetch(game_file: str) -> subprocess.Popen:
+    """
+    Launch stage_next_round in a detached background process
+
+    Args:
+        game_file: Path to the game JSON file
+
+    Returns:
+        The background process
+    """
+    return subprocess.Popen(
+        [sys.executable, "-m", "beepboopyoucad.prefetch", str(game_file)],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+
+
+def take_staged_round(game, ttl: float = DEFAULT_TTL, wait: float = DEFAULT_WAIT):
+    """
+    Claim the staged next round for a game, if one matches its current state
+
+    Staged rounds for the same game that don't match are discarded.
+
+    Args:
+        game: The game
+        ttl: Ignore and delete staged rounds older than this many seconds
+        wait: How long to wait for a matching prefetch that is still running
+
+    Returns:
+        The staged GameRound, moved into place, or None
+    """
+    from .game import GameRound
+
+    directory = staging_dir(game)
+    if not directory.exists():
+        return None
+    expire_staged(directory, ttl)
+
+    key = round_key(game)
+    stem = f"{game.game_id}_{key}"
+    staged_file = directory / f"{stem}.json"
+    lock_file = directory / f"{stem}.lock"
+
+    if _lock_held(lock_file) and not staged_file.exists():
+        print(f"⏳ Waiting up to {wait:g}s for the running prefetch of round {len(game.rounds) + 1}...")
+        deadline = time.time() + wait
+        while _lock_held(lock_file) and not staged_file.exists() and time.time() < deadline:
+            time.sleep(0.2)
+        if not staged_file.exists():
+            print("Warning: Prefetch didn't finish in time, computing the round now")
+
+    # Anything else staged for this game was computed from a different state
+    for path in directory.glob(f"{game.game_id}_*"):
+        if not path.name.startswith(stem):
+            path.unlink(missing_ok=True)
+
+    if not staged_file.exists():
+        return None
+
+    data = json.loads(staged_file.read_text())
+    staged_file.unlink()
+    staged = GameRound.from_dict(data["round"])
+    if staged.content_type == "image":
+        final_path = game.output_dir / f"round_{staged.round_num}_{game.game_id}.png"
+        try:
+            os.replace(staged.content, final_path)
+        except FileNotFoundError:
+            return None
+        staged.content = str(final_path)
+    return staged
+
+
+def main():
+    """Entry point for the background prefetch process"""
+    if len(sys.argv) != 2:
+        print("usage: python -m beepboopyoucad.prefetch GAME_FILE")
+        return 1
+    stage_next_round(sys.argv[1])
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
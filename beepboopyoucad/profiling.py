@@ -0,0 +1,142 @@
+"""
+Lightweight per-phase profiler for rounds, API calls and save/export paths
+
+Code marks phases with `with phase("name"):`. While profiling is disabled that
+is one global lookup returning a shared no-op context manager. While enabled,
+each phase records wall time under its full stack of enclosing phases, and
+write() produces a timing table plus a flamegraph-compatible folded-stacks file.
+"""
+import contextlib
+import os
+import threading
+import time
+from pathlib import Path
+
+ENV_VAR = "BEEPBOOPYOUCAD_PROFILE"
+
+_NULL_PHASE = contextlib.nullcontext()
+_profiler: "Profiler | None" = None
+
+
+class Profiler:
+    """Accumulates wall time per stack of nested phases, across threads"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        # stack tuple -> [calls, total seconds, max seconds]
+        self._stats: dict[tuple[str, ...], list] = {}
+
+    @contextlib.contextmanager
+    def phase(self, name: str):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            # Phases on helper threads (e.g. the background writer) get their own root
+            thread = threading.current_thread()
+            stack = self._local.stack = [] if thread is threading.main_thread() else [thread.name]
+        stack.append(name)
+        key = tuple(stack)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            stack.pop()
+            with self._lock:
+                stats = self._stats.setdefault(key, [0, 0.0, 0.0])
+                stats[0] += 1
+                stats[1] += elapsed
+                stats[2] = max(stats[2], elapsed)
+
+    def table(self) -> str:
+        """Per-phase timing table, nested phases indented under their parents"""
+        with self._lock:
+            stats = dict(self._stats)
+        # A helper thread's root is its name, which is never timed itself; give
+        # it a row totalling its top-level phases so they have a parent
+        roots: dict[tuple[str, ...], float] = {}
+        for key, (_, total, _) in stats.items():
+            if len(key) == 2 and key[:1] not in stats:
+                roots[key[:1]] = roots.get(key[:1], 0.0) + total
+
+        lines = [f"{'phase':50s} {'calls':>7s} {'total ms':>12s} {'mean ms':>10s} {'max ms':>10s}"]
+        for key in sorted(stats.keys() | roots.keys()):
+            label = "  " * (len(key) - 1) + key[-1]
+            if key in roots:
+                lines.append(f"{label:50s} {'-':>7s} {roots[key] * 1000:12.2f} {'-':>10s} {'-':>10s}")
+                continue
+            calls, total, longest = stats[key]
+            lines.append(f"{label:50s} {calls:7d} {total * 1000:12.2f} {total / calls * 1000:10.2f} {longest * 1000:10.2f}")
+        return "\n".join(lines) + "\n"
+
+    def folded(self) -> str:
+        """
+        Folded stacks ("a;b;c <microseconds>") of self time, for flamegraph.pl,
+        speedscope and similar tools
+        """
+        with self._lock:
+            stats = dict(self._stats)
+        self_time = {key: value[1] for key, value in stats.items()}
+        for key, value in stats.items():
+            if len(key) > 1 and key[:-1] in self_time:
+                self_time[key[:-1]] -= value[1]
+        lines = []
+        for key in sorted(self_time):
+            micros = int(self_time[key] * 1_000_000)
+            if micros > 0:
+                lines.append(f"{';'.join(key)} {micros}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, output_dir: str | Path, name: str) -> tuple[Path, Path]:
+        """
+        Write the timing table and folded stacks
+
+        Args:
+            output_dir: Directory to write into
+            name: Base name, e.g. the game ID
+
+        Returns:
+            Paths of the table and folded-stacks files
+        """
+        output_dir = Path(output_dir)
+        table_file = output_dir / f"profile_{name}.txt"
+        folded_file = output_dir / f"profile_{name}.folded"
+        table_file.write_text(self.table())
+        folded_file.write_text(self.folded())
+        return table_file, folded_file
+
+
+def phase(name: str):
+    """
+    Context manager timing a phase when profiling is enabled, a no-op otherwise
+
+    Args:
+        name: Phase name
+    """
+    if _profiler is None:
+        return _NULL_PHASE
+    return _profiler.phase(name)
+
+
+def enable() -> Profiler:
+    """Turn profiling on (if it isn't already) and return the active profiler"""
+    global _profiler
+    if _profiler is None:
+        _profiler = Profiler()
+    return _profiler
+
+
+def disable():
+    """Turn profiling off and discard collected timings"""
+    global _profiler
+    _profiler = None
+
+
+def get_profiler() -> Profiler | None:
+    """The active profiler, or None when profiling is disabled"""
+    return _profiler
+
+
+def env_enabled() -> bool:
+    """Whether the BEEPBOOPYOUCAD_PROFILE environment variable asks for profiling"""
+    return os.getenv(ENV_VAR, "").strip().lower() not in ("", "0", "false", "no", "off")
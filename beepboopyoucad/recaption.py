@@ -0,0 +1,247 @@
+"""
+Re-caption images from existing games with a new describe prompt
+
+Only Claude is called; no images are generated. Results go to a JSON Lines
+side table keyed by (image, prompt), so interrupted runs resume where they
+stopped and finished pairs are never paid for twice.
+"""
+import argparse
+import fnmatch
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Set, Tuple
+
+from dotenv import load_dotenv
+
+from .claude_client import ClaudeClient
+
+
+def find_games(paths: Iterable[str], style: str | None = None, game_pattern: str | None = None) -> List[Path]:
+    """
+    Collect game files from files and directories, optionally filtered
+
+    Args:
+        paths: Game JSON files, or directories containing game_*.json files
+        style: Only games whose style contains this text (case-insensitive)
+        game_pattern: Only games whose ID matches this glob pattern
+
+    Returns:
+        Matching game files, sorted
+    """
+    game_files = set()
+    for path in map(Path, paths):
+        if path.is_dir():
+            game_files.update(path.glob("game_*.json"))
+        elif path.exists():
+            game_files.add(path)
+
+    matches = []
+    for game_file in sorted(game_files):
+        if style is None and game_pattern is None:
+            matches.append(game_file)
+            continue
+        data = _read_game(game_file)
+        if data is None:
+            continue
+        if style is not None and style.lower() not in (data.get("style") or "").lower():
+            continue
+        if game_pattern is not None and not fnmatch.fnmatch(str(data.get("game_id", "")), game_pattern):
+            continue
+        matches.append(game_file)
+    return matches
+
+
+def load_done(table_file: Path) -> Set[Tuple[str, str]]:
+    """
+    Read the (image, prompt) pairs already in the side table
+
+    Args:
+        table_file: JSON Lines side table
+
+    Returns:
+        Set of finished (image, prompt) pairs, images as absolute paths
+    """
+    done = set()
+    if not table_file.exists():
+        return done
+    with open(table_file) as f:
+        for line in f:
+            try:
+                row = json.loads(line)
+            except ValueError:
+                # A line cut short by an interrupted run
+                continue
+            done.add((_image_key(row["image"]), row["prompt"]))
+    return done
+
+
+def image_jobs(game_files: Iterable[Path]) -> List[Dict]:
+    """
+    List every image round in the given games
+
+    Args:
+        game_files: Game JSON files
+
+    Returns:
+        One dict per image round with the absolute image path, game ID, round number
+        and the caption it originally got (if any)
+    """
+    jobs = []
+    for game_file in game_files:
+        data = _read_game(game_file)
+        if data is None:
+            continue
+        rounds = data.get("rounds", [])
+        for i, round_data in enumerate(rounds):
+            if round_data.get("type") != "image":
+                continue
+            following = rounds[i + 1] if i + 1 < len(rounds) else None
+            jobs.append({
+                "image": _resolve_image(game_file, round_data["content"]),
+                "game_id": data.get("game_id"),
+                "round": round_data.get("round"),
+                "original_caption": following["content"] if following and following.get("type") == "text" else None,
+            })
+    return jobs
+
+
+def recaption(
+    game_files: Iterable[Path],
+    prompt: str,
+    table_file: str | Path,
+    claude: ClaudeClient | None = None,
+    workers: int = 4,
+) -> int:
+    """
+    Describe every not-yet-done image with the given prompt
+
+    Args:
+        game_files: Game JSON files to walk
+        prompt: Describe prompt to run
+        table_file: JSON Lines side table to read and append to
+        claude: Client to use. If None, one is created
+        workers: Maximum number of concurrent Claude requests
+
+    Returns:
+        Number of new captions written
+    """
+    table_file = Path(table_file)
+    done = load_done(table_file)
+    pending = []
+    seen = set()
+    for job in image_jobs(game_files):
+        key = (job["image"], prompt)
+        if key in done or key in seen:
+            continue
+        seen.add(key)
+        pending.append(job)
+
+    print(f"🖼️  {len(pending)} images to caption ({len(done)} already done)")
+    if not pending:
+        return 0
+
+    claude = claude or ClaudeClient()
+    written = 0
+    table_file.parent.mkdir(parents=True, exist_ok=True)
+
+    pool = ThreadPoolExecutor(max_workers=workers)
+    try:
+        with open(table_file, "a") as table:
+            futures = {pool.submit(claude.describe_image, job["image"], prompt): job for job in pending}
+            for future in as_completed(futures):
+                job = futures[future]
+                try:
+                    caption = future.result()
+                except Exception as e:
+                    # Left out of the table, so the next run retries it
+                    print(f"Warning: Failed to caption {job['image']} ({e})")
+                    continue
+                row = dict(job, prompt=prompt, caption=caption, timestamp=datetime.now().isoformat())
+                # One durable line per caption, so a crash loses at most the one in flight
+                table.write(json.dumps(row) + "\n")
+                table.flush()
+                os.fsync(table.fileno())
+                written += 1
+                print(f"📝 {job['game_id']} round {job['round']}: {caption}")
+    finally:
+        # On Ctrl-C, don't start anything that hasn't started yet
+        pool.shutdown(cancel_futures=True)
+
+    return written
+
+
+def _read_game(game_file: Path) -> Dict | None:
+    try:
+        return json.loads(game_file.read_text())
+    except (OSError, ValueError) as e:
+        print(f"Warning: Skipping unreadable game file {game_file} ({e})")
+        return None
+
+
+def _resolve_image(game_file: Path, image_path: str) -> str:
+    """Find an image whose recorded path was relative to a different working directory"""
+    if not Path(image_path).exists():
+        beside_game = game_file.parent / Path(image_path).name
+        if beside_game.exists():
+            image_path = str(beside_game)
+    return _image_key(image_path)
+
+
+def _image_key(image_path: str) -> str:
+    """Absolute form of an image path, so side table keys don't depend on the working directory"""
+    return str(Path(image_path).resolve())
+
+
+def main():
+    """CLI entry point for re-captioning"""
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(
+        description="Re-caption images from existing games with a new describe prompt",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Example:
+  %(prog)s "What story does this image tell?" output/
+  %(prog)s "Caption this in five words." output/ --style pencil --workers 8
+        """
+    )
+    parser.add_argument("prompt", type=str, help="Describe prompt to run over every image")
+    parser.add_argument("paths", nargs="+", help="Game JSON files or directories containing them")
+    parser.add_argument(
+        "--table",
+        type=str,
+        default="recaptions.jsonl",
+        help="JSON Lines file results are appended to (default: recaptions.jsonl)"
+    )
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent Claude requests (default: 4)")
+    parser.add_argument("--style", type=str, help="Only games whose style contains this text")
+    parser.add_argument("--game", type=str, metavar="PATTERN", help="Only games whose ID matches this glob")
+    args = parser.parse_args()
+
+    if args.workers < 1:
+        print("❌ Error: --workers must be at least 1")
+        return 1
+
+    if not os.getenv("ANTHROPIC_API_KEY"):
+        print("❌ Error: ANTHROPIC_API_KEY environment variable not set")
+        print("   Please set it in your .env file or environment")
+        return 1
+
+    game_files = find_games(args.paths, style=args.style, game_pattern=args.game)
+    print(f"📂 {len(game_files)} games")
+
+    try:
+        written = recaption(game_files, args.prompt, args.table, workers=args.workers)
+    except KeyboardInterrupt:
+        print("\n\n⚠️  Interrupted; rerun the same command to resume")
+        return 130
+
+    print(f"💾 {written} new captions saved: {args.table}")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,225 @@
+"""
+Pool of pre-generated starting sentences, refilled in bulk
+"""
+import argparse
+import contextlib
+import json
+import re
+import subprocess
+import sys
+import threading
+from pathlib import Path
+from typing import Dict, Set, Tuple
+
+try:
+    import fcntl
+except ImportError:
+    # No cross-process locking on Windows; threads in one process are still safe
+    fcntl = None
+
+from .claude_client import ClaudeClient
+from .history import read_first_round
+from .writer import atomic_write_text
+
+
+def _seed_key(sentence: str) -> str:
+    """Normalize a sentence for duplicate detection"""
+    return " ".join(re.findall(r"[a-z0-9']+", sentence.lower()))
+
+
+def archived_seeds(archive_dir: str) -> Set[str]:
+    """
+    Collect the normalized starting sentences of every game in a directory
+
+    Args:
+        archive_dir: Directory containing game_*.json files
+
+    Returns:
+        Set of normalized seeds
+    """
+    seeds = set()
+    for game_file in Path(archive_dir).glob("game_*.json"):
+        try:
+            first = read_first_round(game_file)
+        except (OSError, ValueError, KeyError):
+            continue
+        if first is not None and first.content_type == "text":
+            seeds.add(_seed_key(first.content))
+    return seeds
+
+
+class SeedPool:
+    """Local file of unused starting sentences that new games draw from"""
+
+    def __init__(
+        self,
+        pool_file: str,
+        claude: ClaudeClient | None = None,
+        archive_dir: str | None = None,
+        low_water: int = 20,
+        batch_size: int = 50,
+    ):
+        """
+        Initialize the pool
+
+        Args:
+            pool_file: JSON file holding the pool
+            claude: Client used for refills. If None, one is created on first refill
+            archive_dir: Directory of past games whose seeds must not be reused
+            low_water: Start a background refill process when fewer seeds than this remain
+            batch_size: How many sentences to ask for per refill request
+        """
+        self.pool_file = Path(pool_file)
+        self.claude = claude
+        self.archive_dir = archive_dir
+        self.low_water = low_water
+        self.batch_size = batch_size
+
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._locked():
+            return len(self._read()["seeds"])
+
+    def draw(self) -> str:
+        """
+        Take a seed from the pool, refilling it if needed
+
+        Returns:
+            An unused starting sentence
+        """
+        seed, remaining = self._take()
+        if seed is None:
+            # Empty pool: nothing to do but refill right here
+            self.refill()
+            seed, remaining = self._take()
+            if seed is None:
+                raise RuntimeError("Seed pool is empty and refill produced no new sentences")
+
+        if remaining < self.low_water:
+            self.refill_in_background()
+        return seed
+
+    def refill(self) -> int:
+        """
+        Ask Claude for a batch of sentences and add the new ones to the pool
+
+        Returns:
+            Number of sentences added
+        """
+        if self.claude is None:
+            self.claude = ClaudeClient()
+        sentences = self.claude.generate_initial_sentences(self.batch_size)
+        past = archived_seeds(self.archive_dir) if self.archive_dir else set()
+
+        with self._locked():
+            # Re-read: other processes may have drawn or refilled since we started
+            data = self._read()
+            known = past | {_seed_key(s) for s in data["seeds"]} | {_seed_key(s) for s in data["used"]}
+            added = 0
+            for sentence in sentences:
+                key = _seed_key(sentence)
+                if key and key not in known:
+                    known.add(key)
+                    data["seeds"].append(sentence)
+                    added += 1
+            self._write(data)
+        return added
+
+    def refill_in_background(self) -> subprocess.Popen | None:
+        """
+        Start a refill in a detached process, so it outlives this one
+
+        Returns:
+            The refill process, or None if a refill is already running
+        """
+        if self._refill_running():
+            return None
+        args = [sys.executable, "-m", "beepboopyoucad.seed_pool", str(self.pool_file), "--batch-size", str(self.batch_size)]
+        if self.archive_dir:
+            args += ["--archive", str(self.archive_dir)]
+        return subprocess.Popen(
+            args,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+
+    def _take(self) -> Tuple[str | None, int]:
+        """Remove the next seed from the pool file; returns it and how many remain"""
+        with self._locked():
+            data = self._read()
+            if not data["seeds"]:
+                return None, 0
+            seed = data["seeds"].pop(0)
+            data["used"].append(seed)
+            self._write(data)
+            return seed, len(data["seeds"])
+
+    @contextlib.contextmanager
+    def _locked(self):
+        """Hold the pool lock, across threads and (where supported) processes"""
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            self.pool_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self._lock_file(".lock"), "a") as lock:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _refill_running(self) -> bool:
+        """Whether some process holds the refill lock"""
+        if fcntl is None or not self._lock_file(".refill").exists():
+            return False
+        with open(self._lock_file(".refill"), "a") as lock:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return True
+            fcntl.flock(lock, fcntl.LOCK_UN)
+        return False
+
+    def _lock_file(self, suffix: str) -> Path:
+        return self.pool_file.with_name(self.pool_file.name + suffix)
+
+    def _read(self) -> Dict:
+        """Read the pool file; caller must hold the lock"""
+        data = {"seeds": [], "used": []}
+        if self.pool_file.exists():
+            data.update(json.loads(self.pool_file.read_text()))
+        return data
+
+    def _write(self, data: Dict):
+        """Write the pool file; caller must hold the lock"""
+        atomic_write_text(self.pool_file, json.dumps(data, indent=2))
+
+
+def main():
+    """Entry point for the background refill process"""
+    parser = argparse.ArgumentParser(description="Refill a seed pool file")
+    parser.add_argument("pool_file", type=str)
+    parser.add_argument("--archive", type=str)
+    parser.add_argument("--batch-size", type=int, default=50)
+    args = parser.parse_args()
+
+    pool = SeedPool(args.pool_file, archive_dir=args.archive, batch_size=args.batch_size)
+    if fcntl is None:
+        pool.refill()
+        return 0
+    with open(pool._lock_file(".refill"), "a") as lock:
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            # Another refill got there first
+            return 0
+        pool.refill()
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,114 @@
+"""
+Background writer that keeps disk I/O off the round's critical path
+"""
+import atexit
+import os
+import queue
+import stat
+import tempfile
+import threading
+from pathlib import Path
+from typing import Callable
+
+_STOP = object()
+
+# Reading the umask means setting it, which isn't thread-safe; do it once, up front
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def atomic_write_text(path: Path, text: str):
+    """
+    Durably replace a file's contents: write a temp file, fsync it, rename it over
+
+    The file keeps its permissions, or gets the umask's defaults if it is new.
+
+    Args:
+        path: File to write
+        text: New contents
+    """
+    path = Path(path)
+    try:
+        mode = stat.S_IMODE(path.stat().st_mode)
+    except FileNotFoundError:
+        mode = 0o666 & ~_UMASK
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        # mkstemp makes the file 0600; give it the mode a plain open() would have
+        os.chmod(tmp_name, mode)
+        with os.fdopen(fd, "w") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+class BackgroundWriter:
+    """Runs write jobs on a background thread, one at a time, in submission order"""
+
+    def __init__(self):
+        self._queue: queue.Queue = queue.Queue()
+        self._errors: list[BaseException] = []
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="beepboopyoucad-writer", daemon=True)
+        self._thread.start()
+        # Make sure queued writes land even if nobody calls close()
+        atexit.register(self.close)
+
+    def submit(self, fn: Callable, *args, **kwargs):
+        """
+        Queue a write job, first re-raising any earlier job's failure
+
+        Args:
+            fn: Function to run on the writer thread
+            *args, **kwargs: Arguments for fn
+        """
+        if self._closed:
+            raise RuntimeError("BackgroundWriter is closed")
+        # Fail fast, so callers stop doing expensive work whose results can't be saved
+        self.check()
+        self._queue.put((fn, args, kwargs))
+
+    def flush(self):
+        """Wait for every queued job to finish, re-raising the first failure"""
+        self._queue.join()
+        self.check()
+
+    def close(self):
+        """Flush outstanding jobs and stop the writer thread"""
+        if self._closed:
+            return
+        self._closed = True
+        atexit.unregister(self.close)
+        self._queue.put(_STOP)
+        self._thread.join()
+        self.flush()
+
+    def __enter__(self) -> "BackgroundWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def check(self):
+        """Re-raise the first failure of a job that has already run, if any"""
+        if self._errors:
+            error = self._errors[0]
+            self._errors.clear()
+            raise error
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            try:
+                if job is _STOP:
+                    return
+                fn, args, kwargs = job
+                fn(*args, **kwargs)
+            except BaseException as e:
+                self._errors.append(e)
+            finally:
+                self._queue.task_done()
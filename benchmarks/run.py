@@ -0,0 +1,219 @@
+"""
+Microbenchmarks for the local hot paths of Beep Boop You CAD
+
+Runs fully offline: API keys are dummies and every provider call is mocked.
+
+Usage:
+  python benchmarks/run.py            # run and print results
+  python benchmarks/run.py --update   # run and write the baseline
+  python benchmarks/run.py --check    # run and fail if anything regressed
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+# Add repo root to path so we can import beepboopyoucad
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+DEFAULT_BASELINE = Path(__file__).parent / "baseline.json"
+DEFAULT_THRESHOLD = 1.5
+# Differences below this many seconds are treated as noise
+NOISE_FLOOR = 0.0005
+
+
+def _timeit(fn, repeat: int) -> float:
+    """Return the best wall time of `repeat` calls to fn, in seconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _make_game(output_dir: str, num_rounds: int, image_path: str | None = None):
+    """Build a game with num_rounds alternating text/image rounds"""
+    from beepboopyoucad.game import Game, GameRound
+
+    game = Game(output_dir=output_dir, game_id="bench", style="a sloppy pencil sketch")
+    for i in range(1, num_rounds + 1):
+        if i % 2:
+            game.rounds.append(GameRound(i, "text", f"A robot number {i} dancing in the rain"))
+        else:
+            game.rounds.append(GameRound(i, "image", image_path or f"{output_dir}/round_{i}_bench.png"))
+    return game
+
+
+def _make_image(path: Path, size: int = 512) -> Path:
+    """Write a noisy PNG so it doesn't compress to nothing"""
+    from PIL import Image
+
+    img = Image.frombytes("RGB", (size, size), os.urandom(size * size * 3))
+    img.save(path)
+    return path
+
+
+def bench_save_game_history(tmpdir: str, results: dict):
+    """Cost of saving a game of num_rounds rounds: a full rewrite, and the save after each new round"""
+    from beepboopyoucad.game import GameRound
+
+    for num_rounds, repeat in ((10, 50), (1_000, 10), (100_000, 3)):
+        game = _make_game(tmpdir, num_rounds)
+
+        def rewrite():
+            # Every round is still resident, so this saves like a first save or a legacy file
+            game.rounds._compact = False
+            game._save_game_history()
+
+        def add_round_and_save():
+            round_num = len(game.rounds) + 1
+            game.rounds.append(GameRound(round_num, "text", f"A robot number {round_num} dancing in the rain"))
+            game._save_game_history()
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            results[f"save_game_history_full[{num_rounds}]"] = _timeit(rewrite, repeat)
+            results[f"save_game_history_append[{num_rounds}]"] = _timeit(add_round_and_save, repeat)
+
+
+def bench_load(tmpdir: str, results: dict):
+    from beepboopyoucad.game import Game
+
+    for num_rounds, repeat in ((10, 50), (1_000, 10), (100_000, 3)):
+        game = _make_game(tmpdir, num_rounds)
+        with contextlib.redirect_stdout(io.StringIO()):
+            game._save_game_history()
+        game_file = str(Path(tmpdir) / "game_bench.json")
+        # Building the SDK clients costs far more than parsing; keep it out of the timing
+        with mock.patch("beepboopyoucad.game.ClaudeClient"), mock.patch("beepboopyoucad.game.NanoBananaClient"):
+            results[f"load[{num_rounds}]"] = _timeit(lambda: Game.load(game_file), repeat)
+
+
+def bench_save_html(tmpdir: str, results: dict):
+    image_path = _make_image(Path(tmpdir) / "bench_image.png")
+    game = _make_game(tmpdir, 200, image_path=str(image_path))
+    with contextlib.redirect_stdout(io.StringIO()):
+        game._save_game_history()
+        results["save_html[100 images]"] = _timeit(game.save_html, 5)
+
+
+def bench_placeholder_image(tmpdir: str, results: dict):
+    from beepboopyoucad.google_client import NanoBananaClient
+
+    client = NanoBananaClient()
+    output_path = str(Path(tmpdir) / "placeholder.png")
+    prompt = "A purple elephant wearing sunglasses rides a skateboard through a busy city street."
+    results["create_placeholder_image"] = _timeit(
+        lambda: client._create_placeholder_image(prompt, output_path), 20
+    )
+
+
+def bench_describe_image(tmpdir: str, results: dict):
+    from beepboopyoucad.claude_client import ClaudeClient
+
+    image_path = str(_make_image(Path(tmpdir) / "describe.png", size=1024))
+    client = ClaudeClient()
+    response = SimpleNamespace(content=[SimpleNamespace(text='"A robot in the rain"')])
+    with mock.patch.object(client.client.messages, "create", return_value=response):
+        results["describe_image[1024px]"] = _timeit(lambda: client.describe_image(image_path), 20)
+
+
+def bench_cli_import(results: dict):
+    repo_root = str(Path(__file__).parent.parent)
+
+    def run():
+        subprocess.run(
+            [sys.executable, "-c", "import beepboopyoucad.main"],
+            cwd=repo_root,
+            check=True,
+        )
+
+    results["cli_import"] = _timeit(run, 5)
+
+
+def run_benchmarks() -> dict:
+    """Run every benchmark and return {name: seconds}"""
+    os.environ.setdefault("ANTHROPIC_API_KEY", "bench_key_anthropic")
+    os.environ.setdefault("GOOGLE_API_KEY", "bench_key_google")
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmpdir:
+        bench_save_game_history(tmpdir, results)
+        bench_load(tmpdir, results)
+        bench_save_html(tmpdir, results)
+        bench_placeholder_image(tmpdir, results)
+        bench_describe_image(tmpdir, results)
+    bench_cli_import(results)
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float = DEFAULT_THRESHOLD) -> list[str]:
+    """
+    Compare results against a baseline
+
+    Args:
+        results: Fresh {name: seconds} timings
+        baseline: Stored {name: seconds} timings
+        threshold: Allowed slowdown ratio before a benchmark counts as regressed
+
+    Returns:
+        A list of human-readable regression messages (empty if none)
+    """
+    regressions = []
+    for name, seconds in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if seconds > base * threshold and seconds - base > NOISE_FLOOR:
+            regressions.append(f"{name}: {seconds * 1000:.2f}ms vs baseline {base * 1000:.2f}ms ({seconds / base:.2f}x)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run Beep Boop You CAD microbenchmarks")
+    parser.add_argument("--baseline", type=str, default=str(DEFAULT_BASELINE), help="Baseline JSON file")
+    parser.add_argument("--update", action="store_true", help="Write results to the baseline file")
+    parser.add_argument("--check", action="store_true", help="Exit non-zero if any benchmark regressed")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help=f"Allowed slowdown ratio vs baseline (default: {DEFAULT_THRESHOLD})"
+    )
+    args = parser.parse_args()
+
+    results = run_benchmarks()
+    for name, seconds in results.items():
+        print(f"{name:40s} {seconds * 1000:10.2f} ms")
+
+    baseline_file = Path(args.baseline)
+    if args.update:
+        baseline_file.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"\n💾 Baseline saved: {baseline_file}")
+        return 0
+
+    if args.check:
+        if not baseline_file.exists():
+            print(f"\n❌ Error: Baseline not found: {baseline_file} (run with --update first)")
+            return 1
+        regressions = compare(results, json.loads(baseline_file.read_text()), args.threshold)
+        if regressions:
+            print("\n❌ Regressions:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print("\n✅ No regressions")
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,80 @@
+"""
+Shared test doubles for the API clients
+"""
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+
+class FakeClaude:
+    """Stands in for ClaudeClient, returning canned text instead of calling the API"""
+
+    def __init__(self, captions=None, sentences=(), fail_on=None):
+        """
+        Args:
+            captions: Captions for describe_image to hand out in order. If None, each
+                image is captioned with the prompt and its file name
+            sentences: Batches for generate_initial_sentences to hand out in order
+            fail_on: describe_image raises for image paths ending with this
+        """
+        self.captions = None if captions is None else list(captions)
+        self.sentences = list(sentences)
+        self.fail_on = fail_on
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def describe_image(self, image_path, prompt=None):
+        with self._lock:
+            self.calls.append(("describe_image", image_path, prompt))
+        if self.fail_on and str(image_path).endswith(self.fail_on):
+            raise RuntimeError("overloaded")
+        if self.captions is not None:
+            return self.captions.pop(0)
+        return f"{prompt or 'A robot in the rain'}: {Path(image_path).name}"
+
+    def generate_initial_sentences(self, count):
+        with self._lock:
+            self.calls.append(("generate_initial_sentences", count))
+        return self.sentences.pop(0) if self.sentences else []
+
+
+class FakeBanana:
+    """Stands in for NanoBananaClient, writing a stub file instead of calling the API"""
+
+    def __init__(self):
+        self.calls = []
+
+    def generate_image(self, prompt, output_path, style=None):
+        self.calls.append((prompt, output_path, style))
+        Path(output_path).write_bytes(b"png")
+        return output_path
+
+
+@pytest.fixture
+def fake_claude():
+    """The FakeClaude class, for tests that need their own canned captions or sentences"""
+    return FakeClaude
+
+
+@pytest.fixture
+def fake_banana():
+    """The FakeBanana class, for tests that build their own clients"""
+    return FakeBanana
+
+
+@pytest.fixture
+def api_keys(monkeypatch):
+    """Dummy API keys, removed again after the test"""
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test_key_anthropic")
+    monkeypatch.setenv("GOOGLE_API_KEY", "test_key_google")
+
+
+@pytest.fixture
+def fake_clients(monkeypatch):
+    """Make every Game in the test share one FakeClaude and one FakeBanana"""
+    clients = SimpleNamespace(claude=FakeClaude(), banana=FakeBanana())
+    monkeypatch.setattr("beepboopyoucad.game.ClaudeClient", lambda: clients.claude)
+    monkeypatch.setattr("beepboopyoucad.game.NanoBananaClient", lambda: clients.banana)
+    return clients
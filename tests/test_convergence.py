@@ -0,0 +1,111 @@
+"""
+Tests for convergence detection and the batch runner
+"""
+import json
+
+import pytest
+
+from beepboopyoucad.game import GameRound
+
+
+@pytest.fixture
+def make_game(api_keys, fake_claude, fake_banana):
+    from beepboopyoucad.game import Game
+
+    def make(output_dir, captions, stop_policy=None):
+        game = Game(output_dir=str(output_dir), stop_policy=stop_policy)
+        game.claude = fake_claude(captions=captions)
+        game.banana = fake_banana()
+        return game
+
+    return make
+
+
+def text_rounds(*captions):
+    rounds = []
+    for caption in captions:
+        rounds.append(GameRound(len(rounds) + 1, "text", caption))
+        rounds.append(GameRound(len(rounds) + 1, "image", "unused.png"))
+    return rounds[:-1]
+
+
+def test_text_similarity():
+    from beepboopyoucad.convergence import text_similarity
+
+    assert text_similarity("A robot in the rain", "a robot in the RAIN!") == 1.0
+    assert text_similarity("A robot in the rain", "Two cats play chess") == 0.0
+    assert text_similarity("Un café à Paris", "un CAFÉ à paris") == 1.0
+    assert text_similarity("Un café à Paris", "Un caf à Paris") < 1.0
+    assert text_similarity("", "...") == 0.0
+
+
+def test_policy_keeps_going_on_changing_non_latin_captions():
+    from beepboopyoucad.convergence import ConvergencePolicy, text_similarity
+
+    assert text_similarity("雨の中で踊るロボット", "帽子をかぶった猫") == 0.0
+    captions = ["雨の中で踊るロボット", "帽子をかぶった猫", "丸太の上の犬", "空飛ぶ象", "海辺の灯台"]
+    assert ConvergencePolicy().check(text_rounds(*captions)) is None
+
+
+def test_policy_detects_plateau():
+    from beepboopyoucad.convergence import ConvergencePolicy
+
+    policy = ConvergencePolicy(plateau_rounds=2)
+    rounds = text_rounds("A cat on a hat", "A robot in the rain", "A robot in the rain", "A robot in the rain")
+    assert policy.check(rounds).startswith("converged")
+    assert policy.check(rounds[:-2]) is None
+
+
+def test_policy_detects_cycle():
+    from beepboopyoucad.convergence import ConvergencePolicy
+
+    policy = ConvergencePolicy()
+    rounds = text_rounds("A cat on a hat", "A dog on a log", "A cat on a hat")
+    assert policy.check(rounds) == "cycle: round 5 repeats round 1"
+
+
+def test_default_policy_waits_for_plateau_on_repeats():
+    from beepboopyoucad.convergence import ConvergencePolicy
+
+    policy = ConvergencePolicy()
+    repeats = text_rounds("A cat on a hat", "A robot in the rain", "A robot in the rain", "A robot in the rain")
+    assert policy.check(repeats) is None
+
+    more = text_rounds("A cat on a hat", *["A robot in the rain"] * 4)
+    assert policy.check(more) == "converged: captions stopped changing after round 3"
+
+
+def test_game_stops_and_records_reason(tmp_path, make_game):
+    from beepboopyoucad.convergence import ConvergencePolicy
+    from beepboopyoucad.game import Game
+
+    game = make_game(tmp_path, ["A robot in the rain"] * 5, stop_policy=ConvergencePolicy(plateau_rounds=2))
+    game.start("A robot in the rain")
+
+    played = 0
+    while game.play_round():
+        played += 1
+    assert played < 10
+    assert game.stop_reason.startswith("converged")
+
+    data = json.loads((tmp_path / f"game_{game.game_id}.json").read_text())
+    assert data["stop_reason"] == game.stop_reason
+
+    loaded = Game.load(str(tmp_path / f"game_{game.game_id}.json"))
+    assert loaded.stop_reason == game.stop_reason
+    assert loaded.play_round() is False
+
+
+def test_batch_reinvests_saved_budget(tmp_path, make_game):
+    from beepboopyoucad.batch import run_batch
+    from beepboopyoucad.convergence import ConvergencePolicy
+
+    stuck = make_game(tmp_path / "stuck", ["A robot in the rain"] * 10, stop_policy=ConvergencePolicy(plateau_rounds=1))
+    stuck.start("A robot in the rain")
+    drifting = make_game(tmp_path / "drifting", [f"Caption number {i}" for i in range(20)])
+    drifting.start("A cat on a hat")
+
+    run_batch([stuck, drifting], budget=20)
+    assert stuck.stop_reason is not None
+    assert len(stuck.rounds) - 1 + len(drifting.rounds) - 1 == 20
+    assert len(drifting.rounds) > len(stuck.rounds)
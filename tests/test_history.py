@@ -0,0 +1,181 @@
+"""
+Tests for the compact, file-backed round history
+"""
+import json
+
+import pytest
+
+from beepboopyoucad.game import GameRound
+from beepboopyoucad.history import RoundHistory
+
+
+def make_history(path, num_rounds, window=4):
+    history = RoundHistory(path, window=window)
+    for i in range(1, num_rounds + 1):
+        history.append(GameRound(i, "text" if i % 2 else "image", f"content {i}"))
+    history.save_job({"game_id": "g", "style": "sketch"}, {"stop_reason": None})()
+    return history
+
+
+def test_game_round_timestamps_round_trip():
+    for stamp in ("2026-01-04T12:00:00.123456", "2026-01-04T12:00:00", "2026-01-04T12:00:00+02:00", "yesterday"):
+        assert GameRound(1, "text", "x", stamp).timestamp == stamp
+    assert isinstance(GameRound(1, "text", "x", "2026-01-04T12:00:00")._timestamp, int)
+    assert not hasattr(GameRound(1, "text", "x"), "__dict__")
+
+
+def test_saved_file_is_plain_json(tmp_path):
+    path = tmp_path / "game_g.json"
+    make_history(path, 10)
+    data = json.loads(path.read_text())
+    assert data["game_id"] == "g"
+    assert data["stop_reason"] is None
+    assert [r["round"] for r in data["rounds"]] == list(range(1, 11))
+
+
+def test_load_keeps_only_recent_window(tmp_path):
+    path = tmp_path / "game_g.json"
+    make_history(path, 1000)
+
+    history, meta = RoundHistory.load(path, window=4)
+    assert meta == {"game_id": "g", "style": "sketch", "stop_reason": None}
+    assert len(history) == 1000
+    assert len(history._recent) == 4
+    assert history[-1].content == "content 1000"
+    assert history[0].content == "content 1"
+    assert history[500].round_num == 501
+    assert [r.round_num for r in history[-3:]] == [998, 999, 1000]
+    assert [r.round_num for r in history] == list(range(1, 1001))
+
+
+def test_appends_in_place_and_evicts_saved_rounds(tmp_path):
+    path = tmp_path / "game_g.json"
+    make_history(path, 10)
+    history, _ = RoundHistory.load(path, window=4)
+
+    for i in range(11, 21):
+        history.append(GameRound(i, "text", f"content {i}"))
+        history.save_job({"game_id": "g"}, {"stop_reason": "done" if i == 20 else None})()
+    assert len(history._recent) <= 5
+    assert history[12].content == "content 13"
+
+    data = json.loads(path.read_text())
+    assert data["stop_reason"] == "done"
+    assert [r["content"] for r in data["rounds"]] == [f"content {i}" for i in range(1, 21)]
+
+
+def test_legacy_layout_is_loaded_and_rewritten(tmp_path):
+    path = tmp_path / "game_g.json"
+    rounds = [GameRound(i, "text", f"content {i}").to_dict() for i in range(1, 6)]
+    path.write_text(json.dumps({"game_id": "g", "style": None, "rounds": rounds}, indent=2))
+
+    history, meta = RoundHistory.load(path)
+    assert meta["game_id"] == "g"
+    assert len(history) == 5
+    history.save_job(meta, {"stop_reason": None})()
+
+    reloaded, _ = RoundHistory.load(path)
+    assert reloaded._compact
+    assert [r.content for r in reloaded] == [f"content {i}" for i in range(1, 6)]
+
+
+def test_torn_append_is_recovered(tmp_path):
+    path = tmp_path / "game_g.json"
+    make_history(path, 5)
+    # Simulate a crash partway through writing round 6
+    text = path.read_text()
+    path.write_text(text[:text.rindex("]")] + ',{"round": 6, "ty')
+
+    history, meta = RoundHistory.load(path)
+    assert len(history) == 5
+    history.append(GameRound(6, "text", "content 6"))
+    history.save_job({"game_id": "g"}, {"stop_reason": None})()
+    assert [r["round"] for r in json.loads(path.read_text())["rounds"]] == list(range(1, 7))
+
+
+def test_torn_closing_line_is_recovered(tmp_path):
+    path = tmp_path / "game_g.json"
+    make_history(path, 5)
+    # Simulate a crash partway through rewriting the closing line
+    text = path.read_text()
+    path.write_text(text[:text.rindex("]")] + '], "stop_re')
+
+    history, meta = RoundHistory.load(path)
+    assert len(history) == 5
+    assert "stop_reason" not in meta
+    history.append(GameRound(6, "text", "content 6"))
+    history.save_job({"game_id": "g"}, {"stop_reason": None})()
+    assert [r["round"] for r in json.loads(path.read_text())["rounds"]] == list(range(1, 7))
+
+
+def test_round_written_over_closing_line_is_recovered(tmp_path):
+    path = tmp_path / "game_g.json"
+    make_history(path, 5)
+    # A crash after part of round 6 overwrote the old closing line
+    text = path.read_text()
+    path.write_text(text[:text.rindex("]")] + ',{"round": 6, "tyop_reason": null}\n')
+
+    history, _ = RoundHistory.load(path)
+    assert len(history) == 5
+    history.append(GameRound(6, "text", "content 6"))
+    history.save_job({"game_id": "g"}, {"stop_reason": None})()
+    assert [r["round"] for r in json.loads(path.read_text())["rounds"]] == list(range(1, 7))
+
+
+def test_failed_save_refuses_later_saves(tmp_path, monkeypatch):
+    path = tmp_path / "game_g.json"
+    history = make_history(path, 5)
+
+    history.append(GameRound(6, "text", "content 6"))
+    job = history.save_job({"game_id": "g"}, {"stop_reason": None})
+    queued = history.save_job({"game_id": "g"}, {"stop_reason": "done"})
+    with monkeypatch.context() as m:
+        m.setattr("beepboopyoucad.history.os.fsync", lambda fd: (_ for _ in ()).throw(OSError("disk full")))
+        with pytest.raises(OSError, match="disk full"):
+            job()
+    with pytest.raises(RuntimeError, match="earlier save"):
+        queued()
+    with pytest.raises(RuntimeError, match="earlier save"):
+        history.save_job({"game_id": "g"}, {"stop_reason": None})
+    assert history._durable == 5
+
+    reloaded, _ = RoundHistory.load(path)
+    reloaded.append(GameRound(len(reloaded) + 1, "text", "more"))
+    reloaded.save_job({"game_id": "g"}, {"stop_reason": None})()
+    data = json.loads(path.read_text())
+    assert [r["round"] for r in data["rounds"]] == list(range(1, len(reloaded) + 1))
+
+
+def test_read_saved_streams_from_the_file(tmp_path):
+    path = tmp_path / "game_g.json"
+    history = make_history(path, 100)
+    history.append(GameRound(101, "text", "content 101"))
+
+    assert [r.round_num for r in history.read_saved(100)] == list(range(1, 101))
+    with pytest.raises(RuntimeError, match="100 of 101"):
+        list(history.read_saved(101))
+
+
+def test_summary_lists_rounds_and_caps_long_games(tmp_path, fake_clients, capsys):
+    from beepboopyoucad.game import SUMMARY_MAX_ROUNDS, Game
+
+    game = Game(output_dir=str(tmp_path), game_id="g")
+    game.start("A robot dancing in the rain")
+    for _ in range(9):
+        game.play_round()
+    capsys.readouterr()
+    game.print_summary()
+    out = capsys.readouterr().out
+    assert all(f"Round {i} " in out for i in range(1, 11))
+
+    for _ in range(SUMMARY_MAX_ROUNDS):
+        game.play_round()
+    assert game.rounds._recent_start > 0
+    capsys.readouterr()
+    game.print_summary()
+    out = capsys.readouterr().out
+    listed = [line for line in out.splitlines() if line.startswith("Round ")]
+    assert len(listed) == SUMMARY_MAX_ROUNDS
+    assert listed[0] == "Round 1 (Text):"
+    assert listed[-1].startswith(f"Round {len(game.rounds)} (")
+    assert f"... {len(game.rounds) - SUMMARY_MAX_ROUNDS} more rounds in" in out
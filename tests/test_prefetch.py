@@ -0,0 +1,68 @@
+"""
+Tests for speculative prefetch of the next round
+"""
+import os
+from pathlib import Path
+
+
+def test_continue_commits_staged_round(tmp_path, fake_clients):
+    from beepboopyoucad.game import Game
+    from beepboopyoucad.prefetch import stage_next_round
+
+    game = Game(output_dir=str(tmp_path), game_id="g")
+    game.start("A robot dancing in the rain")
+    stage_next_round(str(game.history_file))
+    assert len(fake_clients.banana.calls) == 1
+
+    loaded = Game.load(str(game.history_file), prefetch=True)
+    loaded.play_round()
+    assert len(fake_clients.banana.calls) == 1
+    assert loaded.rounds[-1].content == str(tmp_path / "round_2_g.png")
+    assert Path(loaded.rounds[-1].content).read_bytes() == b"png"
+    assert list((tmp_path / ".prefetch").iterdir()) == []
+
+
+def test_stale_staged_round_is_discarded(tmp_path, fake_clients):
+    from beepboopyoucad.game import Game
+    from beepboopyoucad.prefetch import stage_next_round
+
+    game = Game(output_dir=str(tmp_path), game_id="g")
+    game.start("A robot dancing in the rain")
+    stage_next_round(str(game.history_file))
+
+    # The game moved on without the prefetch
+    game.play_round()
+    game.play_round()
+    loaded = Game.load(str(game.history_file), prefetch=True)
+    loaded.play_round()
+    assert len(fake_clients.banana.calls) == 3
+    assert list((tmp_path / ".prefetch").iterdir()) == []
+
+
+def test_expired_staged_round_is_ignored(tmp_path, fake_clients):
+    from beepboopyoucad.game import Game
+    from beepboopyoucad.prefetch import stage_next_round, take_staged_round
+
+    game = Game(output_dir=str(tmp_path), game_id="g")
+    game.start("A robot dancing in the rain")
+    stage_next_round(str(game.history_file))
+
+    assert take_staged_round(game, ttl=-1) is None
+    assert list((tmp_path / ".prefetch").iterdir()) == []
+
+
+def test_running_prefetch_wait_is_announced_and_bounded(tmp_path, fake_clients, capsys):
+    from beepboopyoucad.game import Game
+    from beepboopyoucad.prefetch import round_key, staging_dir, take_staged_round
+
+    game = Game(output_dir=str(tmp_path), game_id="g")
+    game.start("A robot dancing in the rain")
+    directory = staging_dir(game)
+    directory.mkdir()
+    # A prefetch that never finishes: the lock names this (live) process
+    (directory / f"g_{round_key(game)}.lock").write_text(str(os.getpid()))
+
+    assert take_staged_round(game, wait=0.3) is None
+    out = capsys.readouterr().out
+    assert "Waiting up to 0.3s for the running prefetch of round 2" in out
+    assert "computing the round now" in out
@@ -0,0 +1,76 @@
+"""
+Tests for the per-phase profiler
+"""
+import pytest
+
+from beepboopyoucad import profiling
+
+
+@pytest.fixture(autouse=True)
+def reset_profiler():
+    profiling.disable()
+    yield
+    profiling.disable()
+
+
+def test_phase_is_shared_noop_when_disabled():
+    assert profiling.phase("a") is profiling.phase("b")
+    assert profiling.get_profiler() is None
+
+
+def test_nested_phases_fold_to_self_time(tmp_path):
+    profiler = profiling.enable()
+    with profiling.phase("play_round"):
+        with profiling.phase("claude_api"):
+            pass
+        with profiling.phase("claude_api"):
+            pass
+
+    table_file, folded_file = profiler.write(tmp_path, "g")
+    assert "claude_api" in table_file.read_text()
+
+    stacks = dict(line.rsplit(" ", 1) for line in folded_file.read_text().splitlines())
+    assert set(stacks) <= {"play_round", "play_round;claude_api"}
+    assert "play_round;claude_api" in stacks
+
+
+def test_env_enabled(monkeypatch):
+    monkeypatch.setenv(profiling.ENV_VAR, "1")
+    assert profiling.env_enabled()
+    monkeypatch.setenv(profiling.ENV_VAR, "0")
+    assert not profiling.env_enabled()
+
+
+def test_each_batch_gets_its_own_profile(tmp_path, monkeypatch, fake_clients):
+    from beepboopyoucad.batch import run_batch
+    from beepboopyoucad.game import Game
+
+    monkeypatch.setenv(profiling.ENV_VAR, "1")
+    for batch, rounds in (("first", 4), ("second", 2)):
+        game = Game(output_dir=str(tmp_path / batch))
+        game.start("A robot dancing in the rain")
+        run_batch([game], budget=rounds)
+        assert profiling.get_profiler() is None
+
+        (table_file,) = (tmp_path / batch).glob("profile_batch_*.txt")
+        play_round = next(line for line in table_file.read_text().splitlines() if line.startswith("play_round"))
+        assert int(play_round.split()[1]) == rounds
+
+
+def test_helper_thread_phases_get_a_root_row():
+    import threading
+
+    profiler = profiling.enable()
+
+    def save():
+        with profiling.phase("write_history"):
+            pass
+
+    thread = threading.Thread(target=save, name="beepboopyoucad-writer")
+    thread.start()
+    thread.join()
+
+    lines = profiler.table().splitlines()
+    root = next(i for i, line in enumerate(lines) if line.startswith("beepboopyoucad-writer "))
+    assert lines[root].split()[1] == "-"
+    assert lines[root + 1].startswith("  write_history ")
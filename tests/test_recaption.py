@@ -0,0 +1,66 @@
+"""
+Tests for bulk re-captioning of existing games
+"""
+import json
+from pathlib import Path
+
+
+def write_game(directory, game_id, style, num_images):
+    rounds = [{"round": 1, "type": "text", "content": "A robot dancing in the rain"}]
+    for i in range(num_images):
+        image = directory / f"round_{len(rounds) + 1}_{game_id}.png"
+        image.write_bytes(b"png")
+        rounds.append({"round": len(rounds) + 1, "type": "image", "content": str(image)})
+        rounds.append({"round": len(rounds) + 1, "type": "text", "content": f"caption {i}"})
+    (directory / f"game_{game_id}.json").write_text(json.dumps({"game_id": game_id, "style": style, "rounds": rounds}))
+
+
+def test_find_games_filters_by_style_and_id(tmp_path):
+    from beepboopyoucad.recaption import find_games
+
+    write_game(tmp_path, "a1", "pencil sketch", 1)
+    write_game(tmp_path, "a2", "watercolor", 1)
+    write_game(tmp_path, "b1", "Pencil drawing", 1)
+
+    assert [p.name for p in find_games([str(tmp_path)], style="pencil")] == ["game_a1.json", "game_b1.json"]
+    assert [p.name for p in find_games([str(tmp_path)], game_pattern="a*")] == ["game_a1.json", "game_a2.json"]
+
+
+def test_recaption_resumes_and_skips_done_pairs(tmp_path, fake_claude):
+    from beepboopyoucad.recaption import find_games, recaption
+
+    write_game(tmp_path, "a1", "pencil sketch", 3)
+    table = tmp_path / "recaptions.jsonl"
+    games = find_games([str(tmp_path)])
+
+    flaky = fake_claude(fail_on="round_4_a1.png")
+    assert recaption(games, "Five words.", table, claude=flaky, workers=2) == 2
+    assert len(flaky.calls) == 3
+
+    # Second run only retries the failure
+    retry = fake_claude()
+    assert recaption(games, "Five words.", table, claude=retry) == 1
+    assert [path.rsplit("/", 1)[-1] for _, path, _ in retry.calls] == ["round_4_a1.png"]
+
+    # A new prompt is a new set of pairs
+    assert recaption(games, "Ten words.", table, claude=fake_claude()) == 3
+
+    rows = [json.loads(line) for line in table.read_text().splitlines()]
+    assert len(rows) == 6
+    assert {row["original_caption"] for row in rows} == {"caption 0", "caption 1", "caption 2"}
+
+
+def test_done_pairs_match_from_any_working_directory(tmp_path, monkeypatch, fake_claude):
+    from beepboopyoucad.recaption import find_games, recaption
+
+    # Image paths recorded relative to the directory the game was played from
+    monkeypatch.chdir(tmp_path)
+    games_dir = Path("output")
+    games_dir.mkdir()
+    write_game(games_dir, "a1", "pencil sketch", 2)
+    table = tmp_path / "recaptions.jsonl"
+
+    assert recaption(find_games(["output"]), "Five words.", table, claude=fake_claude()) == 2
+
+    monkeypatch.chdir(games_dir)
+    assert recaption(find_games(["."]), "Five words.", table, claude=fake_claude()) == 0
@@ -0,0 +1,74 @@
+"""
+Tests for the pre-generated seed pool
+"""
+import json
+
+
+def test_refill_dedupes_against_archive_and_pool(tmp_path, fake_claude):
+    from beepboopyoucad.seed_pool import SeedPool
+
+    archive = tmp_path / "output"
+    archive.mkdir()
+    (archive / "game_old.json").write_text(json.dumps({
+        "game_id": "old",
+        "rounds": [{"round": 1, "type": "text", "content": "A robot dancing in the rain."}],
+    }))
+
+    claude = fake_claude(sentences=[["A robot dancing in the rain", "A cat in a hat", "a cat in a hat!", "A dog on a log"]])
+    pool = SeedPool(str(tmp_path / "seeds.json"), claude=claude, archive_dir=str(archive), low_water=0)
+    assert pool.refill() == 2
+    assert len(pool) == 2
+
+
+def test_draw_persists_and_refills_below_low_water(tmp_path, monkeypatch, fake_claude):
+    from beepboopyoucad import seed_pool
+    from beepboopyoucad.seed_pool import SeedPool
+
+    spawned = []
+    monkeypatch.setattr(seed_pool.subprocess, "Popen", lambda args, **kwargs: spawned.append(args))
+
+    pool_file = tmp_path / "seeds.json"
+    claude = fake_claude(sentences=[["One", "Two", "Three"], ["Four", "Five"]])
+    pool = SeedPool(str(pool_file), claude=claude, low_water=3)
+
+    # Empty pool refills synchronously, then hands the top-up to a detached process
+    assert pool.draw() == "One"
+    assert len(claude.calls) == 1
+    assert len(spawned) == 1
+    assert spawned[0][1:4] == ["-m", "beepboopyoucad.seed_pool", str(pool_file)]
+
+    reloaded = SeedPool(str(pool_file), claude=fake_claude(sentences=[]), low_water=0)
+    assert reloaded.draw() == "Two"
+    assert len(reloaded) == 1
+    assert json.loads(pool_file.read_text())["used"] == ["One", "Two"]
+
+
+def test_pools_sharing_a_file_never_hand_out_the_same_seed(tmp_path, fake_claude):
+    from beepboopyoucad.seed_pool import SeedPool
+
+    pool_file = tmp_path / "seeds.json"
+    first = SeedPool(str(pool_file), claude=fake_claude(sentences=[["One", "Two", "Three", "Four"]]), low_water=0)
+    first.refill()
+    second = SeedPool(str(pool_file), claude=fake_claude(sentences=[["Five", "One"]]), low_water=0)
+
+    drawn = [first.draw(), second.draw(), first.draw()]
+    assert second.refill() == 1
+    assert drawn == ["One", "Two", "Three"]
+    assert json.loads(pool_file.read_text()) == {"seeds": ["Four", "Five"], "used": drawn}
+
+
+def test_archived_seeds_reads_only_the_head_of_compact_games(tmp_path):
+    from beepboopyoucad.game import GameRound
+    from beepboopyoucad.history import RoundHistory
+    from beepboopyoucad.seed_pool import archived_seeds
+
+    game_file = tmp_path / "game_g.json"
+    history = RoundHistory(game_file)
+    history.append(GameRound(1, "text", "A robot dancing in the rain."))
+    history.append(GameRound(2, "image", "round_2_g.png"))
+    history.save_job({"game_id": "g"}, {"stop_reason": None})()
+    # Anything past the first round is never parsed
+    with open(game_file, "a") as f:
+        f.write("not json\n")
+
+    assert archived_seeds(str(tmp_path)) == {"a robot dancing in the rain"}
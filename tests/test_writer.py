@@ -0,0 +1,101 @@
+"""
+Tests for the background writer
+"""
+import json
+import stat
+
+import pytest
+
+
+def test_writer_runs_jobs_in_order():
+    from beepboopyoucad.writer import BackgroundWriter
+
+    seen = []
+    with BackgroundWriter() as writer:
+        for i in range(100):
+            writer.submit(seen.append, i)
+    assert seen == list(range(100))
+
+
+def test_writer_flush_reraises_failures():
+    from beepboopyoucad.writer import BackgroundWriter
+
+    def fail():
+        raise OSError("disk full")
+
+    writer = BackgroundWriter()
+    writer.submit(fail)
+    with pytest.raises(OSError, match="disk full"):
+        writer.flush()
+    writer.close()
+
+
+def test_writer_submit_reraises_earlier_failure():
+    from beepboopyoucad.writer import BackgroundWriter
+
+    def fail():
+        raise OSError("disk full")
+
+    writer = BackgroundWriter()
+    writer.submit(fail)
+    writer._queue.join()
+    with pytest.raises(OSError, match="disk full"):
+        writer.submit(print)
+    writer.close()
+
+
+def test_atomic_write_text_leaves_no_temp_files(tmp_path):
+    from beepboopyoucad.writer import atomic_write_text
+
+    target = tmp_path / "game.json"
+    atomic_write_text(target, "first")
+    atomic_write_text(target, "second")
+    assert target.read_text() == "second"
+    assert [p.name for p in tmp_path.iterdir()] == ["game.json"]
+
+
+def test_atomic_write_text_keeps_normal_permissions(tmp_path, monkeypatch):
+    from beepboopyoucad.writer import atomic_write_text
+
+    monkeypatch.setattr("beepboopyoucad.writer._UMASK", 0o022)
+    new_file = tmp_path / "game.html"
+    atomic_write_text(new_file, "first")
+    assert stat.S_IMODE(new_file.stat().st_mode) == 0o644
+
+    new_file.chmod(0o640)
+    atomic_write_text(new_file, "second")
+    assert stat.S_IMODE(new_file.stat().st_mode) == 0o640
+
+
+def test_game_saves_through_writer(tmp_path, api_keys):
+    from beepboopyoucad.game import Game
+    from beepboopyoucad.writer import BackgroundWriter
+
+    with BackgroundWriter() as writer:
+        game = Game(output_dir=str(tmp_path), writer=writer)
+        game.start("A robot dancing in the rain")
+        game.save_html()
+        writer.flush()
+
+    data = json.loads((tmp_path / f"game_{game.game_id}.json").read_text())
+    assert data["rounds"][0]["content"] == "A robot dancing in the rain"
+    assert "A robot dancing in the rain" in (tmp_path / f"game_{game.game_id}.html").read_text()
+
+
+def test_html_includes_rounds_no_longer_in_memory(tmp_path, fake_clients):
+    from beepboopyoucad.game import Game
+    from beepboopyoucad.history import RESIDENT_ROUNDS
+    from beepboopyoucad.writer import BackgroundWriter
+
+    with BackgroundWriter() as writer:
+        game = Game(output_dir=str(tmp_path), writer=writer)
+        game.start("A robot dancing in the rain")
+        for _ in range(RESIDENT_ROUNDS + 10):
+            game.play_round()
+        game.save_html()
+        writer.flush()
+
+    assert game.rounds._recent_start > 0
+    html = (tmp_path / f"game_{game.game_id}.html").read_text()
+    assert html.count("<div class='round'>") == len(game.rounds)
+    assert "A robot dancing in the rain" in html